@@ -6,14 +6,25 @@ import logging
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP, Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.device_registry import DeviceEntry
-
-from .coordinator import DomatSSCPConfigEntry, DomatSSCPCoordinator
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
+
+from .const import DATA_SESSIONS, DATA_WARMUP, DOMAIN, STORAGE_VERSION
+from .coordinator import (
+    DomatSSCPConfigEntry,
+    DomatSSCPCoordinator,
+    DomatSSCPOptionsIndex,
+)
+from .sessions import DomatSSCPSessions
+from .warmup import DomatSSCPWarmup
 
 _LOGGER = logging.getLogger(__name__)
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 _PLATFORMS: list[Platform] = [
     Platform.BINARY_SENSOR,
     Platform.CALENDAR,
@@ -25,15 +36,55 @@ _PLATFORMS: list[Platform] = [
 ]
 
 
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up Domat SSCP: log in to all configured servers/PLC's concurrently.
+
+    Log out of all servers/PLC's when Home Assistant stops.
+    """
+
+    sessions = DomatSSCPSessions(hass)
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, sessions.async_close)
+    hass.data[DOMAIN] = {
+        DATA_SESSIONS: sessions,
+        DATA_WARMUP: DomatSSCPWarmup(
+            hass, hass.config_entries.async_entries(DOMAIN), sessions
+        ),
+    }
+    return True
+
+
 async def async_setup_entry(
     hass: HomeAssistant, config_entry: DomatSSCPConfigEntry
 ) -> bool:
     """Set up Domat SSCP from a config entry."""
 
-    coordinator = DomatSSCPCoordinator(hass, config_entry)
-    await coordinator.async_config_entry_first_refresh()
-    if not coordinator.data:
-        raise ConfigEntryNotReady
+    # Use the session shared with other entries (and the startup warm-up)
+    sessions: DomatSSCPSessions = hass.data[DOMAIN][DATA_SESSIONS]
+    warmup: DomatSSCPWarmup = hass.data[DOMAIN][DATA_WARMUP]
+    session = None
+    try:
+        session = sessions.async_acquire(config_entry)
+    except ValueError:
+        _LOGGER.error("Could not create a connection for %s", config_entry.title)
+    coordinator = DomatSSCPCoordinator(hass, config_entry, session=session)
+    warmup.async_track_first_data(coordinator)
+    if await coordinator.async_load_snapshot():
+        # Set up entities with the saved (stale) data, and refresh in the background
+        # after the warm-up login
+        config_entry.async_create_background_task(
+            hass,
+            _async_first_refresh(warmup, coordinator),
+            name=f"{coordinator.name} first refresh",
+        )
+    else:
+        await warmup.async_wait(config_entry.entry_id)
+        try:
+            await coordinator.async_config_entry_first_refresh()
+            if not coordinator.data:
+                raise ConfigEntryNotReady
+        except Exception:
+            sessions.async_release(config_entry)
+            raise
     # Store the coordinator for later use.
     config_entry.coordinator = coordinator
 
@@ -48,6 +99,15 @@ async def async_setup_entry(
     return True
 
 
+async def _async_first_refresh(
+    warmup: DomatSSCPWarmup, coordinator: DomatSSCPCoordinator
+) -> None:
+    """Refresh the saved (stale) data, once the warm-up has logged in."""
+
+    await warmup.async_wait(coordinator.config_entry.entry_id)
+    await coordinator.async_refresh()
+
+
 # TODO: Remove update listener and use OptionsFlowWithReload
 async def _async_update_listener(hass: HomeAssistant, config_entry: ConfigEntry):
     """Handle config options update.
@@ -66,21 +126,17 @@ async def async_remove_config_entry_device(
     """Allow devices to be deleted from the UI."""
 
     data: dict[str, Any] = config_entry.options.copy()
-    remove: list = []
+    index: DomatSSCPOptionsIndex = config_entry.coordinator.index
 
     # Remove entities for these devices from our options
+    _LOGGER.debug(
+        "Removing entities with device: %s",
+        device_entry.identifiers,
+    )
     for tup in device_entry.identifiers:
-        device = tup[1]
-        _LOGGER.debug(
-            "Removing entities with device: %s",
-            device_entry.identifiers,
-        )
-    for opt, val in data.items():
-        if val.get("device") == device:
-            remove.append(opt)
-    for opt in remove:
-        _LOGGER.debug("Removing entity: %s", opt)
-        data.pop(opt, None)
+        for opt in index.by_device.get(tup[1], []):
+            _LOGGER.debug("Removing entity: %s", opt)
+            data.pop(opt, None)
 
     _LOGGER.debug("New options: %s", data)
     hass.config_entries.async_update_entry(config_entry, options=data)
@@ -92,4 +148,18 @@ async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
     """Unload a config entry."""
 
     _LOGGER.debug("Unload entry")
-    return await hass.config_entries.async_unload_platforms(config_entry, _PLATFORMS)
+    if not await hass.config_entries.async_unload_platforms(config_entry, _PLATFORMS):
+        return False
+    sessions: DomatSSCPSessions = hass.data[DOMAIN][DATA_SESSIONS]
+    sessions.async_release(config_entry)
+    return True
+
+
+async def async_remove_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    """Remove the saved data of a config entry."""
+
+    _LOGGER.debug("Remove entry")
+    store: Store[dict[str, Any]] = Store(
+        hass, STORAGE_VERSION, f"{DOMAIN}.{config_entry.entry_id}"
+    )
+    await store.async_remove()
@@ -5,14 +5,14 @@ from typing import Any
 
 from homeassistant.components.binary_sensor import BinarySensorEntity
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import DomatSSCPConfigEntry
 from .const import DOMAIN
 from .coordinator import DomatSSCPCoordinator
+from .entity import DomatSSCPEntity
 
 # The co-ordinator is used to centralise the data updates
 PARALLEL_UPDATES = 0
@@ -34,28 +34,21 @@ async def async_setup_entry(
 
     # Add binary_sensors (class) with their initialisation data
     binary_sensors: list[BinarySensorEntity] = []
-    for opt in config_entry.options:
-        if (
-            "entity" in config_entry.options[opt]
-            and config_entry.options[opt]["entity"] == Platform.BINARY_SENSOR
-        ):
-            _LOGGER.debug("Adding binary sensor %s: %s", opt, config_entry.options[opt])
-            binary_sensors.append(
-                DomatSSCPBinarySensor(
-                    coordinator=coordinator,
-                    entity_id=opt,
-                    entity_data=config_entry.options[opt],
-                )
+    for opt, entity_data in coordinator.index.platform(Platform.BINARY_SENSOR).items():
+        _LOGGER.debug("Adding binary sensor %s: %s", opt, entity_data)
+        binary_sensors.append(
+            DomatSSCPBinarySensor(
+                coordinator=coordinator,
+                entity_id=opt,
+                entity_data=entity_data,
             )
+        )
     async_add_entities(binary_sensors)
 
 
-class DomatSSCPBinarySensor(CoordinatorEntity, BinarySensorEntity):
+class DomatSSCPBinarySensor(DomatSSCPEntity, BinarySensorEntity):
     """Binary Sensor types for SSCP, using coordinator for updates."""
 
-    _attr_has_entity_name = True
-    _attr_entity_registry_enabled_default = True
-
     def __init__(
         self,
         coordinator: DomatSSCPCoordinator,
@@ -64,11 +57,9 @@ class DomatSSCPBinarySensor(CoordinatorEntity, BinarySensorEntity):
     ) -> None:
         """Initialise a binary sensor with provided data."""
 
-        super().__init__(coordinator)
+        super().__init__(coordinator, entity_id)
 
         # Entity-specific values
-        self.coordinator = coordinator
-        self._attr_unique_id = entity_id
         self._attr_device_class = entity_data["class"]
         self.on_value = entity_data["on"]
         self.off_value = entity_data["off"]
@@ -85,12 +76,10 @@ class DomatSSCPBinarySensor(CoordinatorEntity, BinarySensorEntity):
         )
         _LOGGER.debug("Initialised new %s with: %s", entity_id, entity_data)
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
+    def _update_from_coordinator(self) -> None:
+        """Update our value from the co-ordinator data."""
 
         self._attr_is_on = self._update_value()
-        self.async_write_ha_state()
 
     @property
     def is_on(self) -> bool:
@@ -98,14 +87,6 @@ class DomatSSCPBinarySensor(CoordinatorEntity, BinarySensorEntity):
 
         return self._attr_is_on
 
-    @property
-    def available(self) -> bool:
-        """Is state available?"""
-
-        if self.unique_id in self.coordinator.data:
-            return True
-        return False
-
     def _update_value(self) -> bool:
         """Retrieve our value from the co-ordinator."""
 
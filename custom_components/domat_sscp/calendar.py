@@ -16,12 +16,12 @@ from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import dt as dt_util
 
 from . import DomatSSCPConfigEntry
 from .const import DOMAIN, OPT_CALENDAR_BASE, OPT_CALENDAR_EXCEPTIONS
 from .coordinator import DomatSSCPCoordinator
+from .entity import DomatSSCPEntity
 from .sscp.sscp_schedule import sscp_schedule_basetpg, sscp_schedule_exceptions
 
 # The co-ordinator is used to centralise the data updates
@@ -44,28 +44,21 @@ async def async_setup_entry(
 
     # Add calendars (class) with their initialisation data
     calendars: list[CalendarEntity] = []
-    for opt in config_entry.options:
-        if (
-            "entity" in config_entry.options[opt]
-            and config_entry.options[opt]["entity"] == Platform.CALENDAR
-        ):
-            _LOGGER.debug("Adding calendar %s: %s", opt, config_entry.options[opt])
-            calendars.append(
-                DomatSSCPCalendar(
-                    coordinator=coordinator,
-                    entity_id=opt,
-                    entity_data=config_entry.options[opt],
-                )
-                )
+    for opt, entity_data in coordinator.index.platform(Platform.CALENDAR).items():
+        _LOGGER.debug("Adding calendar %s: %s", opt, entity_data)
+        calendars.append(
+            DomatSSCPCalendar(
+                coordinator=coordinator,
+                entity_id=opt,
+                entity_data=entity_data,
+            )
+        )
     async_add_entities(calendars)
 
 
-class DomatSSCPCalendar(CoordinatorEntity, CalendarEntity):
+class DomatSSCPCalendar(DomatSSCPEntity, CalendarEntity):
     """Calendar types for SSCP, using coordinator for updates."""
 
-    _attr_has_entity_name = True
-    _attr_entity_registry_enabled_default = True
-
     def __init__(
         self,
         coordinator: DomatSSCPCoordinator,
@@ -74,11 +67,9 @@ class DomatSSCPCalendar(CoordinatorEntity, CalendarEntity):
     ) -> None:
         """Initialise a calendar with provided data."""
 
-        super().__init__(coordinator)
+        super().__init__(coordinator, entity_id)
 
         # Entity-specific values
-        self.coordinator = coordinator
-        self._attr_unique_id = entity_id
         if "name" in entity_data:
             self._attr_name = entity_data["name"]
         if "icon" in entity_data:
@@ -105,6 +96,7 @@ class DomatSSCPCalendar(CoordinatorEntity, CalendarEntity):
         self._event: CalendarEvent = None
         self._events: list[CalendarEvent] = []
         self.updating: bool = False
+        self.week: tuple[int, int] | None = None
         self._update_events()
         self._attr_supported_features = (
             CalendarEntityFeature.CREATE_EVENT | \
@@ -117,17 +109,15 @@ class DomatSSCPCalendar(CoordinatorEntity, CalendarEntity):
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
 
-        self._update_events()
+        # Only re-parse schedules that have changed, or when the base week moves on
+        generation = self.coordinator.generations.get(self.unique_id)
+        if generation != self.generation or self.week != _current_week():
+            self.generation = generation
+            self._update_events()
+        else:
+            self._update_current_event()
         self.async_write_ha_state()
 
-    @property
-    def available(self) -> bool:
-        """Is state available?"""
-
-        if self.unique_id in self.coordinator.data:
-            return True
-        return False
-
     @property
     def event(self) -> CalendarEvent | None:
         """Return the next upcoming event."""
@@ -328,9 +318,8 @@ class DomatSSCPCalendar(CoordinatorEntity, CalendarEntity):
             return
 
         calendar_events: list[CalendarEvent] = []
-        current_event = None
-        now = dt_util.now()
         tzinfo = dt_util.get_default_time_zone()
+        self.week = _current_week()
 
         _LOGGER.debug("Getting %s events from %s", self.calendar, self.coordinator.data[self.unique_id].hex())
 
@@ -358,7 +347,20 @@ class DomatSSCPCalendar(CoordinatorEntity, CalendarEntity):
                 uid=sscp_event.id
             )
             calendar_events.append(calendar_event)
-            if calendar_event.start_datetime_local <= now < calendar_event.end_datetime_local:
-                current_event = calendar_event
-        self._event = current_event
         self._events = calendar_events
+        self._update_current_event()
+
+    def _update_current_event(self) -> None:
+        """Find the current event from our (already converted) events."""
+
+        now = dt_util.now()
+        self._event = None
+        for calendar_event in self._events:
+            if calendar_event.start_datetime_local <= now < calendar_event.end_datetime_local:
+                self._event = calendar_event
+
+
+def _current_week() -> tuple[int, int]:
+    """Return the year and week: base schedule events are relative to this week."""
+
+    return dt_util.now().isocalendar()[:2]
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
 import logging
+from types import ModuleType
 from typing import Any
 
 import voluptuous as vol
@@ -17,10 +19,17 @@ from homeassistant.config_entries import (
     OptionsFlow,
     #    OptionsFlowWithReload,
 )
-from homeassistant.const import CONF_IP_ADDRESS, CONF_PASSWORD, CONF_PORT, CONF_USERNAME
-from homeassistant.core import callback
-from homeassistant.exceptions import HomeAssistantError
+from homeassistant.const import (
+    CONF_IP_ADDRESS,
+    CONF_PASSWORD,
+    CONF_PORT,
+    CONF_USERNAME,
+    Platform,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed, HomeAssistantError
 from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.importlib import async_import_module
 from homeassistant.helpers.selector import (
     BooleanSelector,
     BooleanSelectorConfig,
@@ -39,37 +48,40 @@ from .const import (
     CONF_INSADY,
     CONF_LANGUAGE,
     CONF_SSCP_ADDRESS,
+    DEFAULT_DEADBAND,
+    DEFAULT_DEADBAND_RELATIVE,
     DEFAULT_FAST_COUNT,
     DEFAULT_FAST_INTERVAL,
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_KEEPALIVE,
+    DEFAULT_PUBLISH_INTERVAL,
     DEFAULT_SCAN_INTERVAL,
     DEFAULT_SSCP_ADDRESS,
     DEFAULT_SSCP_PORT,
+    DEFAULT_WATCH_MAX_AGE,
     DEFAULT_WRITE_RETRIES,
     DOMAIN,
+    OPT_DEADBAND,
+    OPT_DEADBAND_RELATIVE,
+    OPT_COUNT,
     OPT_DEVICE,
     OPT_ENTITY,
     OPT_EXISTING_DEVICE,
     OPT_FAST_COUNT,
     OPT_FAST_INTERVAL,
+    OPT_IDLE_TIMEOUT,
+    OPT_KEEPALIVE,
     OPT_POLLING,
+    OPT_PUBLISH_INTERVAL,
     OPT_SCAN_INTERVAL,
     OPT_UID,
+    OPT_WATCH,
+    OPT_WATCH_MAX_AGE,
     OPT_WRITE_RETRIES,
+    PROBE_MAX_COUNT,
 )
 from .coordinator import DomatSSCPCoordinator
-from .insady.insady_options_flow import (
-    get_air_configs,
-    get_air_schema,
-    get_apartment_configs,
-    get_apartment_schema,
-    get_calendar_configs,
-    get_calendar_schema,
-    get_energy_configs,
-    get_energy_schema,
-    get_room_configs,
-    get_room_schema,
-)
-from .sscp.sscp_connection import sscp_connection
+from .sscp.sscp_connection import sscp_connection, sscp_login_refused
 from .sscp.sscp_const import SSCP_ERRORS
 from .sscp.sscp_variable import sscp_variable
 
@@ -121,6 +133,58 @@ _WRITE_RETRIES_SELECTOR = vol.All(
     ),
     vol.Coerce(int),
 )
+_WATCH_MAX_AGE_SELECTOR = vol.All(
+    NumberSelector(
+        NumberSelectorConfig(min=60, mode=NumberSelectorMode.BOX),
+    ),
+    vol.Coerce(int),
+)
+_DEADBAND_SELECTOR = vol.All(
+    NumberSelector(
+        NumberSelectorConfig(min=0, step="any", mode=NumberSelectorMode.BOX),
+    ),
+    vol.Coerce(float),
+)
+_PUBLISH_INTERVAL_SELECTOR = vol.All(
+    NumberSelector(
+        NumberSelectorConfig(min=0, mode=NumberSelectorMode.BOX),
+    ),
+    vol.Coerce(int),
+)
+_IDLE_SELECTOR = vol.All(
+    NumberSelector(
+        NumberSelectorConfig(min=0, mode=NumberSelectorMode.BOX),
+    ),
+    vol.Coerce(int),
+)
+_PROBE_UID_SELECTOR = vol.All(
+    NumberSelector(
+        NumberSelectorConfig(min=0, mode=NumberSelectorMode.BOX),
+    ),
+    vol.Coerce(int),
+)
+_PROBE_COUNT_SELECTOR = vol.All(
+    NumberSelector(
+        NumberSelectorConfig(min=1, max=PROBE_MAX_COUNT, mode=NumberSelectorMode.BOX),
+    ),
+    vol.Coerce(int),
+)
+_WATCH_SELECTOR = vol.All(
+    EntitySelector(
+        EntitySelectorConfig(
+            EntityFilterSelectorConfig(integration=DOMAIN),
+            multiple=True
+        )
+    ),
+)
+_SENSOR_SELECTOR = vol.All(
+    EntitySelector(
+        EntitySelectorConfig(
+            EntityFilterSelectorConfig(integration=DOMAIN, domain=Platform.SENSOR),
+            multiple=False
+        )
+    ),
+)
 _ENTITY_SELECTOR = vol.All(
     EntitySelector(
         EntitySelectorConfig(
@@ -130,10 +194,15 @@ _ENTITY_SELECTOR = vol.All(
     ),
 )
 
+# InSady options flow, only imported when used
+_INSADY_MODULE = f"{__package__}.insady.insady_options_flow"
+# InSady schemas without user input, by builder and language
+_INSADY_SCHEMAS: dict[tuple[str, str], vol.Schema] = {}
+
 # Options flow menus
 _INSADY_MENU = ["insady_room", "insady_apartment", "insady_energy", "insady_air", "insady_calendar"]
 _DEVICE_MENU = ["entity_rm"]
-_CONFIG_MENU = ["poll", "info"]
+_CONFIG_MENU = ["poll", "hold", "probe", "info"]
 
 class DomatSSCPConfigFlow(ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Domat SSCP."""
@@ -177,7 +246,6 @@ class DomatSSCPConfigFlow(ConfigFlow, domain=DOMAIN):
 
         if self.source == SOURCE_RECONFIGURE:
             entry = self._get_reconfigure_entry()
-            coordinator: DomatSSCPCoordinator = entry.coordinator
             input_data = entry.data
             step = "reconfigure"
         elif self.source == SOURCE_REAUTH:
@@ -198,10 +266,7 @@ class DomatSSCPConfigFlow(ConfigFlow, domain=DOMAIN):
 
         # Validate the user input and create an entry
         try:
-            info = await _validate_config(
-                data=user_input,
-                variables=None,
-            )
+            info = await _validate_config(data=user_input)
         except TimeoutError:
             errors["base"] = "timeout_connect"
         except (ValueError, OSError):
@@ -211,8 +276,6 @@ class DomatSSCPConfigFlow(ConfigFlow, domain=DOMAIN):
         else:
             # No exception, so either abort or return
             await self.async_set_unique_id(info["unique_id"])
-            if self.source == SOURCE_RECONFIGURE:
-                coordinator.set_last_connect()
             if self.source in (SOURCE_RECONFIGURE, SOURCE_REAUTH):
                 # Don't abort on unique ID mismatch, in case the PLC has a new serial number
                 # self._abort_if_unique_id_mismatch(reason="wrong_plc")
@@ -277,12 +340,13 @@ class DomatSSCPOptionsFlowHandler(OptionsFlow):
 
         step = "insady_room"
         lang=self.config_entry.data.get(CONF_LANGUAGE, "en")
-        schema = get_room_schema(lang, user_input)
+        insady = await _async_import_insady(self.hass)
+        schema = _get_insady_schema(insady.get_room_schema, lang, user_input)
 
         if user_input is None:
             return self.async_show_form(step_id=step, data_schema=schema)
 
-        configs = get_room_configs()
+        configs = insady.get_room_configs()
         return await self._step_insady_common(
             step=step,
             user_input=user_input,
@@ -297,12 +361,13 @@ class DomatSSCPOptionsFlowHandler(OptionsFlow):
 
         step = "insady_apartment"
         lang=self.config_entry.data.get(CONF_LANGUAGE, "en")
-        schema = get_apartment_schema(lang, user_input)
+        insady = await _async_import_insady(self.hass)
+        schema = _get_insady_schema(insady.get_apartment_schema, lang, user_input)
 
         if user_input is None:
             return self.async_show_form(step_id=step, data_schema=schema)
 
-        configs = get_apartment_configs(lang=lang)
+        configs = insady.get_apartment_configs(lang=lang)
         return await self._step_insady_common(
             step=step,
             user_input=user_input,
@@ -317,12 +382,13 @@ class DomatSSCPOptionsFlowHandler(OptionsFlow):
 
         step = "insady_energy"
         lang=self.config_entry.data.get(CONF_LANGUAGE, "en")
-        schema = get_energy_schema(lang, user_input)
+        insady = await _async_import_insady(self.hass)
+        schema = _get_insady_schema(insady.get_energy_schema, lang, user_input)
 
         if user_input is None:
             return self.async_show_form(step_id=step, data_schema=schema)
 
-        configs = get_energy_configs()
+        configs = insady.get_energy_configs()
         return await self._step_insady_common(
             step=step,
             user_input=user_input,
@@ -337,12 +403,13 @@ class DomatSSCPOptionsFlowHandler(OptionsFlow):
 
         step = "insady_air"
         lang=self.config_entry.data.get(CONF_LANGUAGE, "en")
-        schema = get_air_schema(lang, user_input)
+        insady = await _async_import_insady(self.hass)
+        schema = _get_insady_schema(insady.get_air_schema, lang, user_input)
 
         if user_input is None:
             return self.async_show_form(step_id=step, data_schema=schema)
 
-        configs = get_air_configs()
+        configs = insady.get_air_configs()
         return await self._step_insady_common(
             step=step,
             user_input=user_input,
@@ -357,12 +424,13 @@ class DomatSSCPOptionsFlowHandler(OptionsFlow):
 
         step = "insady_calendar"
         lang=self.config_entry.data.get(CONF_LANGUAGE, "en")
-        schema = get_calendar_schema(lang, user_input)
+        insady = await _async_import_insady(self.hass)
+        schema = _get_insady_schema(insady.get_calendar_schema, lang, user_input)
 
         if user_input is None:
             return self.async_show_form(step_id=step, data_schema=schema)
 
-        configs = get_calendar_configs(lang=lang)
+        configs = insady.get_calendar_configs(lang=lang)
         return await self._step_insady_common(
             step=step,
             user_input=user_input,
@@ -448,18 +516,17 @@ class DomatSSCPOptionsFlowHandler(OptionsFlow):
                 }
 
         if len(errors) == 0:
-            # Validate the user input and create an entry
-            coordinator.set_last_connect()
+            # Validate the user input (using the co-ordinator's connection) and create an entry
             try:
-                info = await _validate_config(
-                    data=self.config_entry.data,
+                info = await _validate_variables(
+                    coordinator=coordinator,
                     variables=variables,
                 )
             except TimeoutError:
                 errors["base"] = "timeout_connect"
             except (ValueError, OSError):
                 errors["base"] = "cannot_connect"
-            except InvalidAuth:
+            except ConfigEntryAuthFailed:
                 errors["base"] = "invalid_auth"
             else:
                 # No exception, so either generate an error or return
@@ -552,40 +619,198 @@ class DomatSSCPOptionsFlowHandler(OptionsFlow):
         default_fast_interval = DEFAULT_FAST_INTERVAL
         default_fast_count = DEFAULT_FAST_COUNT
         default_write_retries = DEFAULT_WRITE_RETRIES
+        default_watch: list[str] = []
+        default_watch_max_age = DEFAULT_WATCH_MAX_AGE
+        default_deadband = DEFAULT_DEADBAND
+        default_deadband_relative = DEFAULT_DEADBAND_RELATIVE
+        default_publish_interval = DEFAULT_PUBLISH_INTERVAL
+        default_keepalive = DEFAULT_KEEPALIVE
+        default_idle_timeout = DEFAULT_IDLE_TIMEOUT
+        entity_registry = er.async_get(self.hass)
         if OPT_POLLING in data:
             polling = data[OPT_POLLING]
             default_scan_interval = polling.get(OPT_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
             default_fast_interval = polling.get(OPT_FAST_INTERVAL, DEFAULT_FAST_INTERVAL)
             default_fast_count = polling.get(OPT_FAST_COUNT, DEFAULT_FAST_COUNT)
             default_write_retries = polling.get(OPT_WRITE_RETRIES, DEFAULT_WRITE_RETRIES)
+            default_watch_max_age = polling.get(OPT_WATCH_MAX_AGE, DEFAULT_WATCH_MAX_AGE)
+            default_deadband = polling.get(OPT_DEADBAND, DEFAULT_DEADBAND)
+            default_deadband_relative = polling.get(OPT_DEADBAND_RELATIVE, DEFAULT_DEADBAND_RELATIVE)
+            default_publish_interval = polling.get(OPT_PUBLISH_INTERVAL, DEFAULT_PUBLISH_INTERVAL)
+            default_keepalive = polling.get(OPT_KEEPALIVE, DEFAULT_KEEPALIVE)
+            default_idle_timeout = polling.get(OPT_IDLE_TIMEOUT, DEFAULT_IDLE_TIMEOUT)
+            # Watched entities are saved as our entity ID's (uid-offset-length)
+            for unique_id in polling.get(OPT_WATCH, []):
+                if unique_id not in data:
+                    continue
+                entity = entity_registry.async_get_entity_id(
+                    data[unique_id].get(OPT_ENTITY), DOMAIN, unique_id
+                )
+                if entity is not None:
+                    default_watch.append(entity)
         if user_input is not None:
             default_scan_interval = user_input.get(OPT_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
             default_fast_interval = user_input.get(OPT_FAST_INTERVAL, DEFAULT_FAST_INTERVAL)
             default_fast_count = user_input.get(OPT_FAST_COUNT, DEFAULT_FAST_COUNT)
             default_write_retries = user_input.get(OPT_WRITE_RETRIES, DEFAULT_WRITE_RETRIES)
+            default_watch = user_input.get(OPT_WATCH, [])
+            default_watch_max_age = user_input.get(OPT_WATCH_MAX_AGE, DEFAULT_WATCH_MAX_AGE)
+            default_deadband = user_input.get(OPT_DEADBAND, DEFAULT_DEADBAND)
+            default_deadband_relative = user_input.get(OPT_DEADBAND_RELATIVE, DEFAULT_DEADBAND_RELATIVE)
+            default_publish_interval = user_input.get(OPT_PUBLISH_INTERVAL, DEFAULT_PUBLISH_INTERVAL)
+            default_keepalive = user_input.get(OPT_KEEPALIVE, DEFAULT_KEEPALIVE)
+            default_idle_timeout = user_input.get(OPT_IDLE_TIMEOUT, DEFAULT_IDLE_TIMEOUT)
         schema = vol.Schema(
             {
                 vol.Required(OPT_SCAN_INTERVAL, default=default_scan_interval): _SCAN_INTERVAL_SELECTOR,
                 vol.Required(OPT_FAST_INTERVAL, default=default_fast_interval): _FAST_INTERVAL_SELECTOR,
                 vol.Required(OPT_FAST_COUNT, default=default_fast_count): _FAST_COUNT_SELECTOR,
                 vol.Required(OPT_WRITE_RETRIES, default=default_write_retries): _WRITE_RETRIES_SELECTOR,
+                vol.Optional(OPT_WATCH, default=default_watch): _WATCH_SELECTOR,
+                vol.Required(OPT_WATCH_MAX_AGE, default=default_watch_max_age): _WATCH_MAX_AGE_SELECTOR,
+                vol.Required(OPT_DEADBAND, default=default_deadband): _DEADBAND_SELECTOR,
+                vol.Required(OPT_DEADBAND_RELATIVE, default=default_deadband_relative): _DEADBAND_SELECTOR,
+                vol.Required(OPT_PUBLISH_INTERVAL, default=default_publish_interval): _PUBLISH_INTERVAL_SELECTOR,
+                vol.Required(OPT_KEEPALIVE, default=default_keepalive): _IDLE_SELECTOR,
+                vol.Required(OPT_IDLE_TIMEOUT, default=default_idle_timeout): _IDLE_SELECTOR,
             }
         )
         if user_input is None:
             return self.async_show_form(step_id=step, data_schema=schema)
 
+        # Only our variables can be watched
+        watch: list[str] = []
+        for entity in user_input.get(OPT_WATCH, []):
+            entity_entry = entity_registry.async_get(entity)
+            if (
+                entity_entry is None
+                or entity_entry.config_entry_id != self.config_entry.entry_id
+                or entity_entry.unique_id not in data
+            ):
+                return self.async_show_form(
+                    step_id=step,
+                    data_schema=schema,
+                    errors={OPT_WATCH: "entity_error"},
+                    description_placeholders={"entity": entity},
+                )
+            watch.append(entity_entry.unique_id)
+
         data.update(
             {
                 OPT_POLLING: {
                     OPT_SCAN_INTERVAL: user_input.get(OPT_SCAN_INTERVAL),
                     OPT_FAST_INTERVAL: user_input.get(OPT_FAST_INTERVAL),
                     OPT_FAST_COUNT: user_input.get(OPT_FAST_COUNT),
-                    OPT_WRITE_RETRIES: user_input.get(OPT_WRITE_RETRIES)
+                    OPT_WRITE_RETRIES: user_input.get(OPT_WRITE_RETRIES),
+                    OPT_WATCH: watch,
+                    OPT_WATCH_MAX_AGE: user_input.get(OPT_WATCH_MAX_AGE),
+                    OPT_DEADBAND: user_input.get(OPT_DEADBAND),
+                    OPT_DEADBAND_RELATIVE: user_input.get(OPT_DEADBAND_RELATIVE),
+                    OPT_PUBLISH_INTERVAL: user_input.get(OPT_PUBLISH_INTERVAL),
+                    OPT_KEEPALIVE: user_input.get(OPT_KEEPALIVE),
+                    OPT_IDLE_TIMEOUT: user_input.get(OPT_IDLE_TIMEOUT),
                 }
             }
         )
         return self.async_create_entry(data=data)
 
+    async def async_step_hold(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Change the deadband and publish interval of a sensor entity."""
+
+        data: dict[str, Any] = self.config_entry.options.copy()
+        step = "hold"
+        polling = data.get(OPT_POLLING, {})
+
+        schema = vol.Schema(
+            {
+                vol.Required(OPT_ENTITY): _SENSOR_SELECTOR,
+                vol.Required(
+                    OPT_DEADBAND, default=polling.get(OPT_DEADBAND, DEFAULT_DEADBAND)
+                ): _DEADBAND_SELECTOR,
+                vol.Required(
+                    OPT_DEADBAND_RELATIVE,
+                    default=polling.get(OPT_DEADBAND_RELATIVE, DEFAULT_DEADBAND_RELATIVE),
+                ): _DEADBAND_SELECTOR,
+                vol.Required(
+                    OPT_PUBLISH_INTERVAL,
+                    default=polling.get(OPT_PUBLISH_INTERVAL, DEFAULT_PUBLISH_INTERVAL),
+                ): _PUBLISH_INTERVAL_SELECTOR,
+            }
+        )
+        if user_input is None:
+            return self.async_show_form(step_id=step, data_schema=schema)
+
+        # Only our sensors can be changed
+        entity = user_input.get(OPT_ENTITY)
+        entity_entry = er.async_get(self.hass).async_get(entity)
+        if (
+            entity_entry is None
+            or entity_entry.config_entry_id != self.config_entry.entry_id
+            or entity_entry.unique_id not in data
+        ):
+            return self.async_show_form(
+                step_id=step,
+                data_schema=schema,
+                errors={OPT_ENTITY: "entity_error"},
+                description_placeholders={"entity": entity},
+            )
+
+        entity_data = dict(data[entity_entry.unique_id])
+        entity_data.update(
+            {
+                OPT_DEADBAND: user_input.get(OPT_DEADBAND),
+                OPT_DEADBAND_RELATIVE: user_input.get(OPT_DEADBAND_RELATIVE),
+                OPT_PUBLISH_INTERVAL: user_input.get(OPT_PUBLISH_INTERVAL),
+            }
+        )
+        data[entity_entry.unique_id] = entity_data
+        return self.async_create_entry(data=data)
+
+    async def async_step_probe(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Find the existing variables in a range of UID's."""
+
+        step = "probe"
+        errors: dict[str, str] = {}
+
+        schema = vol.Schema(
+            {
+                vol.Required(OPT_UID, default=0): _PROBE_UID_SELECTOR,
+                vol.Required(OPT_COUNT, default=100): _PROBE_COUNT_SELECTOR,
+            }
+        )
+        if user_input is None:
+            return self.async_show_form(step_id=step, data_schema=schema)
+
+        first = user_input[OPT_UID]
+        coordinator: DomatSSCPCoordinator = self.config_entry.coordinator
+        try:
+            uid_lengths = await coordinator.async_probe_uids(
+                range(first, first + user_input[OPT_COUNT])
+            )
+        except TimeoutError:
+            errors["base"] = "timeout_connect"
+        except (ValueError, OSError):
+            errors["base"] = "cannot_connect"
+        except ConfigEntryAuthFailed:
+            errors["base"] = "invalid_auth"
+        if len(errors) > 0:
+            return self.async_show_form(step_id=step, data_schema=schema, errors=errors)
+
+        variables = ", ".join(
+            f"{uid} ({length})" for uid, length in sorted(uid_lengths.items())
+        )
+        _LOGGER.info(
+            "Probed UID's %d-%d: %s", first, first + user_input[OPT_COUNT] - 1, variables
+        )
+        return self.async_abort(
+            reason="probe_done",
+            description_placeholders={"count": str(len(uid_lengths)), "variables": variables},
+        )
+
     async def async_step_info(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
@@ -635,22 +860,13 @@ def _check_exists(
     return {"variables": variables}
 
 
-async def _validate_config(
-    data: dict[str, Any],
-    variables: list[sscp_variable] | None,
-) -> dict[str, Any]:
+async def _validate_config(data: dict[str, Any]) -> dict[str, Any]:
     """Validate that the user input allows us to connect using the values provided by the user.
 
     Catches some exceptions to raise InvalidAuth.
-    Returns either information or errors in info[].
+    Returns information in info[].
     """
 
-    # Config flow info
-    unique_id = ""
-    # Options flow info
-    error_code = 0
-    error_vars = []
-
     conn = sscp_connection(
         name=data[CONF_CONNECTION_NAME],
         ip_address=data[CONF_IP_ADDRESS],
@@ -670,45 +886,82 @@ async def _validate_config(
     except TimeoutError:
         _LOGGER.debug("Login timeout")
         raise InvalidAuth from None
+    except sscp_login_refused:
+        _LOGGER.debug("Login refused")
+        raise InvalidAuth from None
 
-    if variables is None:
-        # Config flow
-        # Use user name, SSCP address and PLC serial for unique ID
-        await conn.get_info()
-        if conn.serial is None:
-            _LOGGER.warning("No serial number for %s", data[CONF_CONNECTION_NAME])
-            unique_id = (
-                data[CONF_USERNAME]
-                + "-"
-                + str(data[CONF_SSCP_ADDRESS])
-                + "-0000000000000000"
-            )
-        else:
-            unique_id = (
-                data[CONF_USERNAME]
-                + "-"
-                + str(data[CONF_SSCP_ADDRESS])
-                + "-"
-                + conn.serial
-            )
-        _LOGGER.info("Using unique ID: %s", unique_id)
+    # Use user name, SSCP address and PLC serial for unique ID
+    await conn.get_info()
+    if conn.serial is None:
+        _LOGGER.warning("No serial number for %s", data[CONF_CONNECTION_NAME])
+        unique_id = (
+            data[CONF_USERNAME]
+            + "-"
+            + str(data[CONF_SSCP_ADDRESS])
+            + "-0000000000000000"
+        )
     else:
-        # Options flow
-        error_vars, error_codes = await conn.sscp_read_variables(variables)
-        if len(error_vars) > 0:
-            error_code = error_codes[0]  # We only display the first error
+        unique_id = (
+            data[CONF_USERNAME]
+            + "-"
+            + str(data[CONF_SSCP_ADDRESS])
+            + "-"
+            + conn.serial
+        )
+    _LOGGER.info("Using unique ID: %s", unique_id)
 
     await conn.logout()
 
-    # Return info about the connection or errors.
+    # Return info about the connection.
     return {
         "title": data[CONF_CONNECTION_NAME],
         "unique_id": unique_id,
+    }
+
+
+async def _validate_variables(
+    coordinator: DomatSSCPCoordinator,
+    variables: list[sscp_variable],
+) -> dict[str, Any]:
+    """Validate that the user variables can be read, using the co-ordinator connection.
+
+    Returns errors in info[].
+    """
+
+    error_code = 0
+    error_vars, error_codes = await coordinator.async_read_variables(variables)
+    if len(error_vars) > 0:
+        error_code = next(iter(error_codes.values()))  # We only display the first error
+
+    # Return info about errors, using UID's to match the user input.
+    return {
         "error_code": error_code,
-        "error_variables": error_vars,
+        "error_variables": {uid for uid, _offset, _length in error_vars},
     }
 
 
+async def _async_import_insady(hass: HomeAssistant) -> ModuleType:
+    """Import the InSady options flow on first use (the import is cached)."""
+
+    return await async_import_module(hass, _INSADY_MODULE)
+
+
+def _get_insady_schema(
+    builder: Callable[[str, dict[str, Any] | None], vol.Schema],
+    lang: str,
+    user_input: dict[str, Any] | None,
+) -> vol.Schema:
+    """Return an InSady schema, re-using schemas without user input."""
+
+    if user_input is not None:
+        return builder(lang, user_input)
+
+    key = (builder.__name__, lang)
+    if key not in _INSADY_SCHEMAS:
+        _INSADY_SCHEMAS[key] = builder(lang, None)
+    return _INSADY_SCHEMAS[key]
+
+
 def _get_user_schema(
     input_data: dict[str, Any] | None = None,
     lang: str | None = "en"
@@ -14,15 +14,51 @@ DEFAULT_SCAN_INTERVAL = 300
 DEFAULT_FAST_INTERVAL = 3
 DEFAULT_FAST_COUNT = 5
 DEFAULT_WRITE_RETRIES = 5
+DEFAULT_WATCH_MAX_AGE = 3600
+DEFAULT_DEADBAND = 0
+DEFAULT_DEADBAND_RELATIVE = 0
+DEFAULT_PUBLISH_INTERVAL = 0
+DEFAULT_KEEPALIVE = 60
+DEFAULT_IDLE_TIMEOUT = 900
 DEFAULT_SSCP_PORT = 12346
 DEFAULT_SSCP_ADDRESS = 1
 
+# Integration data (hass.data[DOMAIN])
+DATA_SESSIONS = "sessions"
+DATA_WARMUP = "warmup"
+
+# Maximum concurrent logins when warming up connections at startup
+WARMUP_CONCURRENCY = 8
+
+# Seconds between checks of idle sessions (keepalive and idle timeout)
+IDLE_CHECK_INTERVAL = 15
+
+# Maximum number of UID's to probe at once
+PROBE_MAX_COUNT = 1000
+
+# Saved data (snapshot) storage
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 60
+
+# Seconds after a schedule switches before reading its device's values
+TRANSITION_DELAY = 30
+
+# Seconds before an unconfirmed (optimistic) written value is rolled back
+PENDING_TIMEOUT = 30
+
 # Options flow constants
 OPT_POLLING = "polling"
 OPT_SCAN_INTERVAL = "scan_interval"
 OPT_FAST_INTERVAL = "fast_interval"
 OPT_FAST_COUNT = "fast_count"
 OPT_WRITE_RETRIES = "write_retries"
+OPT_WATCH = "watch"
+OPT_WATCH_MAX_AGE = "watch_max_age"
+OPT_DEADBAND = "deadband"
+OPT_DEADBAND_RELATIVE = "deadband_relative"
+OPT_PUBLISH_INTERVAL = "publish_interval"
+OPT_KEEPALIVE = "keepalive"
+OPT_IDLE_TIMEOUT = "idle_timeout"
 
 OPT_DEVICE = "device"
 OPT_EXISTING_DEVICE = "existing_device"
@@ -34,6 +70,7 @@ OPT_MINIMUM = "minimum"
 OPT_MAXIMUM = "maximum"
 OPT_STEP = "step"
 OPT_ENTITY = "entity"
+OPT_COUNT = "count"
 
 # Calendar constants
 OPT_CALENDAR_BASE = "calendar_base"
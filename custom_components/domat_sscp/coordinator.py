@@ -3,34 +3,75 @@
 from __future__ import annotations
 
 from asyncio import sleep
-from contextlib import suppress
+from collections.abc import Mapping
 from datetime import datetime, timedelta
+from functools import partial
 import logging
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_IP_ADDRESS, CONF_PASSWORD, CONF_PORT, CONF_USERNAME
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.const import (
+    CONF_IP_ADDRESS,
+    CONF_PASSWORD,
+    CONF_PORT,
+    CONF_USERNAME,
+    Platform,
+)
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.event import async_call_later, async_track_point_in_time
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
 from .const import (
     CONF_CONNECTION_NAME,
     CONF_SSCP_ADDRESS,
+    DEFAULT_DEADBAND,
+    DEFAULT_DEADBAND_RELATIVE,
     DEFAULT_FAST_COUNT,
     DEFAULT_FAST_INTERVAL,
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_KEEPALIVE,
+    DEFAULT_PUBLISH_INTERVAL,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_WATCH_MAX_AGE,
     DEFAULT_WRITE_RETRIES,
     DOMAIN,
     OPT_CALENDAR_BASE,
     OPT_CALENDAR_EXCEPTIONS,
+    OPT_DEADBAND,
+    OPT_DEADBAND_RELATIVE,
+    OPT_DEVICE,
     OPT_FAST_COUNT,
     OPT_FAST_INTERVAL,
+    OPT_IDLE_TIMEOUT,
+    OPT_KEEPALIVE,
     OPT_POLLING,
+    OPT_PUBLISH_INTERVAL,
     OPT_SCAN_INTERVAL,
+    OPT_WATCH,
+    OPT_WATCH_MAX_AGE,
     OPT_WRITE_RETRIES,
+    PENDING_TIMEOUT,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+    TRANSITION_DELAY,
+)
+from .sscp.sscp_connection import sscp_connection, sscp_login_refused
+from .sscp.sscp_const import (
+    SCHEDULE_BASETPG_LEN,
+    SCHEDULE_EXCEPTIONS_LEN,
+    SSCP_PRIORITY_POLL,
+    SSCP_PRIORITY_READ,
+    SSCP_PRIORITY_WRITE,
 )
-from .sscp.sscp_connection import sscp_connection
+from .sscp.sscp_schedule import (
+    schedule_write_descending,
+    sscp_schedule_basetpg,
+    sscp_schedule_exceptions,
+)
+from .sscp.sscp_session import sscp_session
 from .sscp.sscp_variable import sscp_variable
 
 _LOGGER = logging.getLogger(__name__)
@@ -39,14 +80,79 @@ _LOGGER = logging.getLogger(__name__)
 type DomatSSCPConfigEntry = ConfigEntry[list[DomatSSCPCoordinator]]
 
 
+class DomatSSCPOptionsIndex:
+    """Entity options, indexed by platform, device and calendar."""
+
+    def __init__(self, options: Mapping[str, Any]) -> None:
+        """Index the options with one pass."""
+
+        self.options = options
+        # Entity ID's of variables (all options with a UID)
+        self.variables: list[str] = []
+        self.by_platform: dict[str, dict[str, dict[str, Any]]] = {}
+        self.by_device: dict[str, list[str]] = {}
+        # Calendar base and exceptions entity ID's, per device
+        self.calendars: dict[str | None, dict[str, str]] = {}
+        self._poll_variables: list[tuple[str, sscp_variable]] | None = None
+
+        for entity_id, entity_data in options.items():
+            if not isinstance(entity_data, Mapping):
+                continue
+            if "uid" in entity_data:
+                self.variables.append(entity_id)
+            if "entity" in entity_data:
+                self.by_platform.setdefault(entity_data["entity"], {})[entity_id] = entity_data
+            if OPT_DEVICE in entity_data:
+                self.by_device.setdefault(entity_data[OPT_DEVICE], []).append(entity_id)
+            if entity_data.get("calendar") in (OPT_CALENDAR_BASE, OPT_CALENDAR_EXCEPTIONS):
+                self.calendars.setdefault(entity_data.get(OPT_DEVICE), {})[
+                    entity_data["calendar"]
+                ] = entity_id
+
+    def platform(self, platform: str) -> dict[str, dict[str, Any]]:
+        """Return the entity options for a platform."""
+
+        return self.by_platform.get(platform, {})
+
+    def poll_variables(self) -> list[tuple[str, sscp_variable]]:
+        """Return the variables to poll, with their entity ID's (uid-offset-length).
+
+        The variables are created on first use, and reused by every poll.
+        """
+
+        if self._poll_variables is None:
+            self._poll_variables = []
+            for opt_var in self.variables:
+                sscp_var = sscp_variable(
+                    uid=self.options[opt_var]["uid"],
+                    offset=self.options[opt_var]["offset"],
+                    length=self.options[opt_var]["length"],
+                    type=self.options[opt_var]["type"],
+                )
+                entity_id = f"{sscp_var.uid}-{sscp_var.offset}-{sscp_var.length}"
+                self._poll_variables.append((entity_id, sscp_var))
+        return self._poll_variables
+
+    def calendar(self, entity_id: str) -> tuple[str | None, str | None]:
+        """Return the calendar base and exceptions entity ID's for a calendar entity."""
+
+        calendar = self.calendars.get(self.options.get(entity_id, {}).get(OPT_DEVICE), {})
+        return calendar.get(OPT_CALENDAR_BASE), calendar.get(OPT_CALENDAR_EXCEPTIONS)
+
+
 class DomatSSCPCoordinator(DataUpdateCoordinator):
     """A co-ordinator to manage fetching SSCP data."""
 
     data: dict[str, Any]
     config_entry: DomatSSCPConfigEntry
 
-    def __init__(self, hass: HomeAssistant, config_entry: DomatSSCPConfigEntry) -> None:
-        """Initialize coordinator."""
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: DomatSSCPConfigEntry,
+        session: sscp_session | None = None,
+    ) -> None:
+        """Initialize coordinator, optionally with an existing (e.g. warmed up) session."""
 
         super().__init__(
             hass,
@@ -71,11 +177,27 @@ class DomatSSCPCoordinator(DataUpdateCoordinator):
             self.write_retries = polling.get(
                 OPT_WRITE_RETRIES, DEFAULT_WRITE_RETRIES
             )
+            self.watch = polling.get(OPT_WATCH, [])
+            self.watch_max_age = polling.get(
+                OPT_WATCH_MAX_AGE, DEFAULT_WATCH_MAX_AGE
+            )
+            self.deadband = polling.get(OPT_DEADBAND, DEFAULT_DEADBAND)
+            self.deadband_relative = polling.get(
+                OPT_DEADBAND_RELATIVE, DEFAULT_DEADBAND_RELATIVE
+            )
+            self.publish_interval = polling.get(
+                OPT_PUBLISH_INTERVAL, DEFAULT_PUBLISH_INTERVAL
+            )
         else:
             self.scan_interval = DEFAULT_SCAN_INTERVAL
             self.fast_interval = DEFAULT_FAST_INTERVAL
             self.fast_count = DEFAULT_FAST_COUNT
             self.write_retries = DEFAULT_WRITE_RETRIES
+            self.watch = []
+            self.watch_max_age = DEFAULT_WATCH_MAX_AGE
+            self.deadband = DEFAULT_DEADBAND
+            self.deadband_relative = DEFAULT_DEADBAND_RELATIVE
+            self.publish_interval = DEFAULT_PUBLISH_INTERVAL
         self.fast_max = min(self.scan_interval, self.fast_interval * self.fast_count)
         self.update_interval = timedelta(seconds=self.scan_interval)
         _LOGGER.debug(
@@ -86,7 +208,51 @@ class DomatSSCPCoordinator(DataUpdateCoordinator):
             self.fast_max,
             self.write_retries
         )
-        self.last_connect: datetime = datetime.now(tz=None)
+
+        # One session, shared by polling, entity writes and options flow validation
+        self.session: sscp_session | None = session
+
+        # Decoded values are cached in data, keyed by entity ID (uid-offset-length)
+        # Generations are only bumped when a value changes, so listeners can skip unchanged values
+        self.generations: dict[str, int] = {}
+        self.read_times: dict[str, datetime] = {}
+        # Small or frequent changes of floats are not published (see _hold_value())
+        self.publish_times: dict[str, datetime] = {}
+        # Error codes of entity ID's which could not be read in the last poll
+        self.error_codes: dict[str, int] = {}
+        # Written values are shown immediately, but are pending until read back
+        # Pending values have the written raw value, the last confirmed value and a timeout
+        self.pending: dict[str, dict[str, Any]] = {}
+        # Writes count when they show, confirm or roll back a value, so that a poll can
+        # tell which of its values were read before a write (see _async_update_data())
+        self.write_count: int = 0
+        self.write_counts: dict[str, int] = {}
+
+        # The last data is saved, so that entities can be set up before the first refresh
+        self.store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{config_entry.entry_id}"
+        )
+        self.stale: bool = False
+        self.snapshot_time: str | None = None
+
+        # In watch mode, only the watched values are read until one changes
+        self.full_read_time: datetime | None = None
+
+        # Devices with schedules are read quickly just after their schedules switch
+        self.next_transition: datetime | None = None
+        self._transition_devices: list[str | None] = []
+        self._transition_unsub: CALLBACK_TYPE | None = None
+
+        self._index: DomatSSCPOptionsIndex | None = None
+
+    @property
+    def index(self) -> DomatSSCPOptionsIndex:
+        """Return the options index, which is built once per options revision."""
+
+        # Updating the options replaces the options mapping
+        if self._index is None or self._index.options is not self.config_entry.options:
+            self._index = DomatSSCPOptionsIndex(self.config_entry.options)
+        return self._index
 
     async def _async_update_data(self):
         """Fetch entity data from the server/PLC."""
@@ -105,11 +271,6 @@ class DomatSSCPCoordinator(DataUpdateCoordinator):
             self.data = data
             return self.data
 
-        # Check the last connection time - we don't want to connect too quickly
-        # Helps to avoid connecting at the same time as config flow validation and entity writes
-        since = datetime.now(tz=None) - self.last_connect
-        if since.seconds < self.fast_interval:
-            await sleep(self.fast_interval)
         # Are we doing fast updates?  If so, do back-off
         if self.update_interval.seconds < self.fast_max:
             interval = min(
@@ -121,75 +282,147 @@ class DomatSSCPCoordinator(DataUpdateCoordinator):
 
         # Fetch variables data
         try:
-            conn = sscp_connection(
-                name=self.config_entry.data[CONF_CONNECTION_NAME],
-                ip_address=self.config_entry.data[CONF_IP_ADDRESS],
-                port=self.config_entry.data[CONF_PORT],
-                user_name=self.config_entry.data[CONF_USERNAME],
-                password=self.config_entry.data[CONF_PASSWORD],
-                sscp_address=self.config_entry.data[CONF_SSCP_ADDRESS],
-            )
+            session = self._get_session()
         except ValueError as error:
             _LOGGER.error(
                 "Fetching data: could not create a connection for %s", self.name
             )
             raise UpdateFailed from error
 
-        try:
-            await conn.login()
-            if conn.socket is None:
-                _LOGGER.error("Fetching data: login failed for %s", self.name)
+        poll_vars = self.index.poll_variables()
+        sscp_vars = [sscp_var for _entity_id, sscp_var in poll_vars]
+
+        watch_vars = self._watch_variables()
+        watched = False
+
+        # Other users of the session go first
+        async with session.connection(SSCP_PRIORITY_POLL) as conn:
+            try:
+                await session.login()
+                if conn.socket is None:
+                    _LOGGER.error("Fetching data: login failed for %s", self.name)
+                    raise ConfigEntryAuthFailed from None
+            except TimeoutError:
+                _LOGGER.error("Fetching data: login timeout for %s", self.name)
+                raise ConfigEntryAuthFailed from None
+            except sscp_login_refused:
+                _LOGGER.error("Fetching data: login refused for %s", self.name)
                 raise ConfigEntryAuthFailed from None
-        except TimeoutError:
-            _LOGGER.error("Fetching data: login timeout for %s", self.name)
-            raise ConfigEntryAuthFailed from None
-        except (ValueError, OSError):
-            _LOGGER.error("Fetching data: login connection error for %s", self.name)
-            raise UpdateFailed from None
+            except (ValueError, OSError):
+                _LOGGER.error("Fetching data: login connection error for %s", self.name)
+                raise UpdateFailed from None
 
-        sscp_vars: list[sscp_variable] = []
-        sscp_vars.extend(
-            sscp_variable(
-                uid=self.config_entry.options[opt_var]["uid"],
-                offset=self.config_entry.options[opt_var]["offset"],
-                length=self.config_entry.options[opt_var]["length"],
-                type=self.config_entry.options[opt_var]["type"],
+            error_vars: set[tuple[int, int, int]] = set()
+            error_codes: dict[tuple[int, int, int], int] = {}
+            read_keys: set[tuple[int, int, int]] = set()
+            # Write count of each entity ID's frame, when it was read
+            read_counts: dict[str, int] = {}
+            read_failed = False
+            try:
+                if watch_vars is not None:
+                    watched = await self._read_watch_variables(conn, watch_vars)
+                if not watched:
+                    # Publish each reply's values as soon as it arrives, so that entities
+                    # update sooner when the read needs several requests
+                    entity_ids = {sscp_var.key: entity_id for entity_id, sscp_var in poll_vars}
+                    # Let writes and other users go first between our read requests
+                    async for frame in conn.sscp_read_frames(
+                        sscp_vars,
+                        error_vars,
+                        error_codes,
+                        between_requests=partial(session.yield_to, SSCP_PRIORITY_POLL),
+                        skip_known_errors=True,
+                    ):
+                        self._publish_values(
+                            {entity_ids[var.key]: var.val for var in frame}
+                        )
+                        read_keys.update(var.key for var in frame)
+                        read_counts.update(
+                            (entity_ids[var.key], self.write_count) for var in frame
+                        )
+            except TimeoutError:
+                if len(read_keys) == 0:
+                    _LOGGER.error("Fetching data: read variables timeout for %s", self.name)
+                    raise UpdateFailed from None
+                _LOGGER.error(
+                    "Fetching data: read variables timeout for %s, keeping %d values",
+                    self.name,
+                    len(read_keys),
+                )
+                read_failed = True
+            except (ValueError, OSError):
+                if len(read_keys) == 0:
+                    _LOGGER.error("Fetching data: read variables failed for %s", self.name)
+                    raise UpdateFailed from None
+                _LOGGER.error(
+                    "Fetching data: read variables failed for %s, keeping %d values",
+                    self.name,
+                    len(read_keys),
+                )
+                read_failed = True
+
+        if watched:
+            _LOGGER.debug("Fetched data: watched values unchanged for %s", self.name)
+            return self.data
+
+        # Variables that weren't read before a failed request are errors (without codes)
+        if read_failed:
+            error_vars.update(
+                sscp_var.key for sscp_var in sscp_vars if sscp_var.key not in read_keys
             )
-            for opt_var in self.config_entry.options if "uid" in self.config_entry.options[opt_var]
-        )
-        try:
-            error_vars, _error_codes = await conn.sscp_read_variables(sscp_vars)
-        except TimeoutError:
-            _LOGGER.error("Fetching data: read variables timeout for %s", self.name)
-            raise UpdateFailed from None
-        except (ValueError, OSError):
-            _LOGGER.error("Fetching data: read variables failed for %s", self.name)
-            raise UpdateFailed from None
-        finally:
-            await conn.logout()
 
+        # Keep error codes for diagnostics
+        self.error_codes = {
+            str(uid) + "-" + str(offset) + "-" + str(length): code
+            for (uid, offset, length), code in error_codes.items()
+        }
         if len(error_vars) > 0:
             _LOGGER.error(
                 "Fetching data: read variable errors for %s: %s", self.name, error_vars
             )
-            raise UpdateFailed from None
+            if len(error_vars) == len(sscp_vars):
+                raise UpdateFailed from None
 
         # Update variables with converted data
-        for sscp_var in sscp_vars:
-            # Recreate entity ID's (uid-length-offset) for our data
-            entity_id = (
-                str(sscp_var.uid)
-                + "-"
-                + str(sscp_var.offset)
-                + "-"
-                + str(sscp_var.length)
-            )
+        # Variables with errors are left out, so only their entities are unavailable
+        for entity_id, sscp_var in poll_vars:
+            if sscp_var.key in error_vars:
+                continue
             data[entity_id] = sscp_var.val
 
-        self.set_last_connect()
+        # Writes between our read requests are newer than the values we read before them
+        written: set[str] = set()
+        for entity_id, count in read_counts.items():
+            if self.write_counts.get(entity_id, 0) <= count:
+                continue
+            written.add(entity_id)
+            if entity_id in self.data:
+                data[entity_id] = self.data[entity_id]
+            else:
+                data.pop(entity_id, None)
+
+        # Keep showing pending values until they are written, then confirm or roll back
+        for entity_id, record in list(self.pending.items()):
+            if entity_id not in data or entity_id in written:
+                continue
+            if record["written"]:
+                del self.pending[entity_id]
+                record["cancel"]()
+            elif entity_id in self.data:
+                record["confirmed"] = data[entity_id]
+                data[entity_id] = self.data[entity_id]
 
         _LOGGER.debug("Fetched data: %s", data)
+        self._update_generations(data)
+        if self.stale:
+            # Entities flag snapshot values as stale: update them all, changed or not
+            for entity_id in self.generations:
+                self.generations[entity_id] += 1
         self.data = data
+        self.stale = False
+        self.full_read_time = datetime.now(tz=None)
+        self._schedule_transition()
+        self.store.async_delay_save(self._snapshot, STORAGE_SAVE_DELAY)
         return self.data
 
     async def entity_update(self, vars: list[dict[str:Any]]) -> None:
@@ -218,15 +451,31 @@ class DomatSSCPCoordinator(DataUpdateCoordinator):
                 states=var.get("states"),
                 perm="rw",
             )
+            sscp_var.record_length = var.get("record_length", 1)
+            sscp_var.write_descending = var.get("descending", False)
             if value is not None:
                 sscp_var.change_value(new=value)
+                # Show the value as it will be read back
+                sscp_var.set_value(raw=sscp_var.raw)
             else:
                 sscp_var.set_value(raw=raw)
             sscp_vars.append(sscp_var)
 
-        since = datetime.now(tz=None) - self.last_connect
-        if since.seconds < self.fast_interval:
-            await sleep(self.fast_interval)
+        # Show the new values now, until they are confirmed or rolled back
+        pending = {
+            sscp_var.key: self._set_pending(sscp_var) for sscp_var in sscp_vars
+        }
+        read_vars: list[sscp_variable] = [
+            sscp_variable(
+                uid=sscp_var.uid,
+                offset=sscp_var.offset,
+                length=sscp_var.length,
+                type=sscp_var.type,
+            )
+            for sscp_var in sscp_vars
+        ]
+        error_vars: set[tuple[int, int, int]] = set()
+
         # Try the write a few times, in case we clash with another connection
         retry = 0
         success = False
@@ -235,46 +484,50 @@ class DomatSSCPCoordinator(DataUpdateCoordinator):
                 await sleep(self.fast_interval)
                 _LOGGER.debug("Retrying write for %s", uids)
             retry += 1
-            self.set_last_connect()
             try:
-                conn = sscp_connection(
-                    name=self.config_entry.data[CONF_CONNECTION_NAME],
-                    ip_address=self.config_entry.data[CONF_IP_ADDRESS],
-                    port=self.config_entry.data[CONF_PORT],
-                    user_name=self.config_entry.data[CONF_USERNAME],
-                    password=self.config_entry.data[CONF_PASSWORD],
-                    sscp_address=self.config_entry.data[CONF_SSCP_ADDRESS],
-                )
+                session = self._get_session()
             except ValueError:
                 _LOGGER.error(
                     "Entity write: could not create a connection for %s", self.name
                 )
                 continue
 
-            try:
-                await conn.login()
-                if conn.socket is None:
-                    _LOGGER.error("Entity write: login failed for %s", self.name)
+            # Writes go before other users of the session
+            async with session.connection(SSCP_PRIORITY_WRITE) as conn:
+                try:
+                    await session.login()
+                    if conn.socket is None:
+                        _LOGGER.error("Entity write: login failed for %s", self.name)
+                        continue
+                except TimeoutError:
+                    _LOGGER.error("Entity write: login timeout for %s", self.name)
+                    continue
+                except sscp_login_refused:
+                    _LOGGER.error("Entity write: login refused for %s", self.name)
+                    continue
+                except (ValueError, OSError):
+                    _LOGGER.error("Entity write: login connection error for %s", self.name)
                     continue
-            except TimeoutError:
-                _LOGGER.error("Entity write: login timeout for %s", self.name)
-                continue
-            except (ValueError, OSError):
-                _LOGGER.error("Entity write: login connection error for %s", self.name)
-                continue
 
-            try:
-                await conn.sscp_write_variables(vars=sscp_vars)
-            except TimeoutError:
-                _LOGGER.error("Entity write: write variable timeout for %s", self.name)
-                continue
-            except (ValueError, OSError) as e:
-                _LOGGER.error(
-                    "Entity write: write variable failed for %s: %s", self.name, e
-                )
-                continue
-            finally:
-                await conn.logout()
+                try:
+                    await conn.sscp_write_variables(vars=sscp_vars, segmented=True)
+                except TimeoutError:
+                    _LOGGER.error("Entity write: write variable timeout for %s", self.name)
+                    continue
+                except (ValueError, OSError) as e:
+                    _LOGGER.error(
+                        "Entity write: write variable failed for %s: %s", self.name, e
+                    )
+                    continue
+
+                # Read back only what we wrote, to confirm the pending values
+                try:
+                    error_vars, _error_codes = await conn.sscp_read_variables(read_vars)
+                except (TimeoutError, ValueError, OSError) as e:
+                    _LOGGER.error(
+                        "Entity write: read back failed for %s: %s", self.name, e
+                    )
+                    error_vars = {read_var.key for read_var in read_vars}
 
             # No exception when writing
             success = True
@@ -282,12 +535,23 @@ class DomatSSCPCoordinator(DataUpdateCoordinator):
 
         if success is not True:
             _LOGGER.error("Entity write failed: %s", uids)
+            for record in pending.values():
+                self._end_pending(record)
+            self.async_update_listeners()
             return
 
-        # Re-read our data using fast polling and send updates to our platforms
+        # Confirm or roll back the pending values, and continue with fast polling
+        for read_var in read_vars:
+            if read_var.key in error_vars:
+                # The next poll confirms or rolls back
+                pending[read_var.key]["written"] = True
+                continue
+            if read_var.raw != pending[read_var.key]["raw"]:
+                _LOGGER.warning(
+                    "Entity write: %s was not changed by %s", read_var.key, self.name
+                )
+            self._end_pending(pending[read_var.key], read_var.val)
         self.update_interval = timedelta(seconds=self.fast_interval)
-        with suppress(UpdateFailed):
-            await self._async_update_data()
         self.async_set_updated_data(self.data)
 
     async def schedule_update(self, schedule_id: str, raw: bytearray) -> None:
@@ -298,17 +562,9 @@ class DomatSSCPCoordinator(DataUpdateCoordinator):
         # Find the base and exceptions schedule entities, and match "schedule_id"
         # Set the values (matched from raw, other from data)
         # Create a vars list and call update
-        base = None
-        exceptions = None
-        base_raw = None
-        exceptions_raw = None
-        for entity_id in self.config_entry.options:
-            if self.config_entry.options[entity_id].get("calendar") == OPT_CALENDAR_BASE:
-                base = entity_id
-                base_raw = self.data.get(entity_id)
-            if self.config_entry.options[entity_id].get("calendar") == OPT_CALENDAR_EXCEPTIONS:
-                exceptions = entity_id
-                exceptions_raw = self.data.get(entity_id)
+        base, exceptions = self.index.calendar(schedule_id)
+        base_raw = self.data.get(base)
+        exceptions_raw = self.data.get(exceptions)
         if base is None or exceptions is None:
             _LOGGER.error("Schedule base or exceptions not configured")
             return
@@ -327,24 +583,509 @@ class DomatSSCPCoordinator(DataUpdateCoordinator):
             exceptions_raw = raw
             _LOGGER.debug("set exceptions: %s", exceptions_raw.hex())
 
+        # Long schedules may be written in segments, so keep their records in order
         base_var: dict[str:Any] = {
             "uid": self.config_entry.options[base]["uid"],
             "length": self.config_entry.options[base]["length"],
             "offset": self.config_entry.options[base]["offset"],
             "type": self.config_entry.options[base]["type"],
-            "raw": base_raw
+            "raw": base_raw,
+            "record_length": SCHEDULE_BASETPG_LEN,
+            "descending": schedule_write_descending(
+                self.data[base], base_raw, SCHEDULE_BASETPG_LEN
+            ),
         }
         exceptions_var: dict[str:Any] = {
             "uid": self.config_entry.options[exceptions]["uid"],
             "length": self.config_entry.options[exceptions]["length"],
             "offset": self.config_entry.options[exceptions]["offset"],
             "type": self.config_entry.options[exceptions]["type"],
-            "raw": exceptions_raw
+            "raw": exceptions_raw,
+            "record_length": SCHEDULE_EXCEPTIONS_LEN,
+            "descending": schedule_write_descending(
+                self.data[exceptions], exceptions_raw, SCHEDULE_EXCEPTIONS_LEN
+            ),
         }
         vars: list[dict[str:Any]] = [base_var, exceptions_var]
         await self.entity_update(vars=vars)
 
+    async def async_read_variables(
+        self, variables: list[sscp_variable]
+    ) -> tuple[set[tuple[int, int, int]], dict[tuple[int, int, int], int]]:
+        """Read variables once for other users, such as options flow validation.
+
+        Variables with fresh values in our cache are not read again.
+        Otherwise, uses our session before any waiting polls.
+        Returns a set of variables (uid, offset, length) with errors and their error codes.
+        Can raise ConfigEntryAuthFailed or exceptions from login() and read().
+        """
+
+        max_age = timedelta(seconds=self.fast_interval)
+        read_vars: list[sscp_variable] = []
+        for var in variables:
+            entity_id = str(var.uid) + "-" + str(var.offset) + "-" + str(var.length)
+            cached = self.get_cached(entity_id, max_age)
+            if cached is not None:
+                var.val = cached
+            else:
+                read_vars.append(var)
+        if len(read_vars) == 0:
+            return set(), {}
+
+        session = self._get_session()
+        async with session.connection(SSCP_PRIORITY_READ) as conn:
+            try:
+                await session.login()
+            except sscp_login_refused:
+                _LOGGER.error("Variables read: login refused for %s", self.name)
+                raise ConfigEntryAuthFailed from None
+            if conn.socket is None:
+                _LOGGER.error("Variables read: login failed for %s", self.name)
+                raise ConfigEntryAuthFailed from None
+            return await conn.sscp_read_variables(read_vars)
+
+    async def async_probe_uids(self, uids: range | list[int]) -> dict[int, int]:
+        """Probe a range or list of UID's for existing variables, using our session.
+
+        Returns a dictionary of existing UID's and their lengths.
+        Can raise ConfigEntryAuthFailed or exceptions from login() and probe.
+        """
+
+        session = self._get_session()
+        async with session.connection(SSCP_PRIORITY_READ) as conn:
+            try:
+                await session.login()
+            except sscp_login_refused:
+                _LOGGER.error("Variables probe: login refused for %s", self.name)
+                raise ConfigEntryAuthFailed from None
+            if conn.socket is None:
+                _LOGGER.error("Variables probe: login failed for %s", self.name)
+                raise ConfigEntryAuthFailed from None
+            return await conn.sscp_probe_uids(uids)
+
+    def _get_session(self) -> sscp_session:
+        """Return our session, creating it (and its connection) on first use.
+
+        Can raise ValueError if the connection configuration is incomplete.
+        """
+
+        if self.session is None:
+            self.session = create_session(self.config_entry)
+        return self.session
+
+    async def async_load_snapshot(self) -> bool:
+        """Load the last saved data, so that entities can be set up before the first refresh.
+
+        Returns True if data was loaded: it is then stale until the next refresh.
+        """
+
+        snapshot = await self.store.async_load()
+        if snapshot is None or "data" not in snapshot:
+            return False
+
+        # Only use values which are still in our options
+        data: dict[str, Any] = {"connection": self.config_entry.unique_id}
+        for entity_id, value in snapshot["data"].items():
+            if entity_id not in self.config_entry.options:
+                continue
+            if isinstance(value, dict) and "raw" in value:
+                value = bytearray.fromhex(value["raw"])
+            data[entity_id] = value
+
+        _LOGGER.debug("Loaded data saved at %s: %s", snapshot.get("time"), data)
+        self._update_generations(data)
+        # Stale values must not be re-used as fresh reads
+        self.read_times.clear()
+        self.data = data
+        self.stale = True
+        self.snapshot_time = snapshot.get("time")
+        self._schedule_transition()
+        return True
+
+    @callback
+    def _snapshot(self) -> dict[str, Any]:
+        """Return our data for saving: raw (schedule) values are saved as hex.
+
+        Pending values are not saved: their last confirmed values are saved instead.
+        """
+
+        self.snapshot_time = dt_util.utcnow().isoformat()
+        data: dict[str, Any] = {}
+        for entity_id, value in self.data.items():
+            if entity_id in self.pending:
+                value = self.pending[entity_id]["confirmed"]
+                if value is None:
+                    continue
+            if isinstance(value, (bytes, bytearray)):
+                data[entity_id] = {"raw": value.hex()}
+            else:
+                data[entity_id] = value
+        return {"time": self.snapshot_time, "data": data}
+
+    def _update_generations(self, data: dict[str, Any]) -> None:
+        """Bump the generations of values that changed, appeared or disappeared."""
+
+        now = datetime.now(tz=None)
+        for entity_id, value in data.items():
+            self.read_times[entity_id] = now
+            if entity_id not in self.data:
+                self.generations[entity_id] = self.generations.get(entity_id, 0) + 1
+                self.publish_times[entity_id] = now
+            elif self.data[entity_id] != value:
+                if self._hold_value(entity_id, self.data[entity_id], value, now):
+                    # Keep the published value
+                    data[entity_id] = self.data[entity_id]
+                    continue
+                self.generations[entity_id] = self.generations.get(entity_id, 0) + 1
+                self.publish_times[entity_id] = now
+        for entity_id in self.data.keys() - data.keys():
+            self.generations[entity_id] = self.generations.get(entity_id, 0) + 1
+            self.read_times.pop(entity_id, None)
+
+    def _hold_value(self, entity_id: str, old: Any, new: Any, now: datetime) -> bool:
+        """Should a changed float sensor value keep its published value?
+
+        Changes within the absolute or relative (%) deadband, or too soon after the last
+        published change, are held.  Entity options override the polling options.
+        Settable values (e.g. setpoints) are never held.
+        """
+
+        if not isinstance(old, float) or not isinstance(new, float):
+            return False
+        if entity_id not in self.index.platform(Platform.SENSOR):
+            return False
+        options = self.index.options.get(entity_id, {})
+        deadband = options.get(OPT_DEADBAND, self.deadband)
+        deadband_relative = options.get(OPT_DEADBAND_RELATIVE, self.deadband_relative)
+        publish_interval = options.get(OPT_PUBLISH_INTERVAL, self.publish_interval)
+
+        change = abs(new - old)
+        if change <= deadband or change <= abs(old) * deadband_relative / 100:
+            return True
+        publish_time = self.publish_times.get(entity_id)
+        return publish_time is not None and now - publish_time < timedelta(
+            seconds=publish_interval
+        )
+
+    async def async_shutdown(self) -> None:
+        """Cancel scheduled reads and shut down."""
+
+        await super().async_shutdown()
+        if self._transition_unsub is not None:
+            self._transition_unsub()
+            self._transition_unsub = None
+
+    @callback
+    def _schedule_transition(self) -> None:
+        """Schedule reads of devices for the next time their schedules switch."""
+
+        now = dt_util.now()
+        tzinfo = dt_util.get_default_time_zone()
+        next_time: datetime | None = None
+        devices: list[str | None] = []
+        for device, calendar in self.index.calendars.items():
+            times: list[datetime] = []
+            for calendar_type, sscp_class, weeks in (
+                (OPT_CALENDAR_BASE, sscp_schedule_basetpg, (0, 1)),
+                (OPT_CALENDAR_EXCEPTIONS, sscp_schedule_exceptions, (0,)),
+            ):
+                entity_id = calendar.get(calendar_type)
+                raw = self.data.get(entity_id)
+                if raw is None:
+                    continue
+                options = self.index.options[entity_id]
+                try:
+                    schedule = sscp_class(
+                        uid=options["uid"],
+                        offset=options["offset"],
+                        length=options["length"],
+                        type=options["type"],
+                    )
+                    schedule.set_value(raw)
+                    events = schedule.to_events()
+                except (TypeError, ValueError):
+                    _LOGGER.debug("Schedule %s could not be parsed", entity_id)
+                    continue
+                # Base events repeat every week
+                times.extend(
+                    time.replace(tzinfo=tzinfo) + timedelta(days=7 * week)
+                    for event in events
+                    for time in (event.start, event.end)
+                    if time is not None
+                    for week in weeks
+                )
+            device_time = min((time for time in times if time > now), default=None)
+            if device_time is None:
+                continue
+            if next_time is None or device_time < next_time:
+                next_time = device_time
+                devices = [device]
+            elif device_time == next_time:
+                devices.append(device)
+
+        if next_time == self.next_transition and devices == self._transition_devices:
+            return
+        if self._transition_unsub is not None:
+            self._transition_unsub()
+            self._transition_unsub = None
+        self.next_transition = next_time
+        self._transition_devices = devices
+        if next_time is None:
+            return
+        _LOGGER.debug("Next schedule switch for %s at %s: %s", self.name, next_time, devices)
+        self._transition_unsub = async_track_point_in_time(
+            self.hass,
+            self._transition,
+            next_time + timedelta(seconds=TRANSITION_DELAY),
+        )
+
     @callback
-    def set_last_connect(self):
-        """Set the last connection time: called from other connect functions too."""
-        self.last_connect = datetime.now(tz=None)
+    def _transition(self, _now: datetime) -> None:
+        """Schedules have switched: read their devices quickly."""
+
+        self._transition_unsub = None
+        entity_ids = [
+            entity_id
+            for device in self._transition_devices
+            for entity_id in self.index.by_device.get(device, [])
+            if "calendar" not in self.index.options[entity_id]
+        ]
+        self.next_transition = None
+        self._schedule_transition()
+        if len(entity_ids) == 0:
+            return
+        self.config_entry.async_create_background_task(
+            self.hass,
+            self._async_read_burst(entity_ids),
+            name=f"{self.name} schedule switch",
+        )
+
+    async def _async_read_burst(self, entity_ids: list[str]) -> None:
+        """Read some of our variables a few times, using fast polling intervals."""
+
+        for count in range(self.fast_count):
+            if count > 0:
+                await sleep(self.fast_interval)
+            try:
+                await self._async_read_entities(entity_ids)
+            except (ConfigEntryAuthFailed, TimeoutError, ValueError, OSError) as e:
+                _LOGGER.error("Schedule switch: read failed for %s: %s", self.name, e)
+                return
+
+    async def _async_read_entities(self, entity_ids: list[str]) -> None:
+        """Read some of our variables and update their entities.
+
+        Can raise ConfigEntryAuthFailed or exceptions from login() and read().
+        """
+
+        options = self.index.options
+        sscp_vars: list[sscp_variable] = [
+            sscp_variable(
+                uid=options[entity_id]["uid"],
+                offset=options[entity_id]["offset"],
+                length=options[entity_id]["length"],
+                type=options[entity_id]["type"],
+            )
+            for entity_id in entity_ids
+        ]
+        session = self._get_session()
+        async with session.connection(SSCP_PRIORITY_POLL) as conn:
+            try:
+                await session.login()
+            except sscp_login_refused:
+                raise ConfigEntryAuthFailed from None
+            if conn.socket is None:
+                raise ConfigEntryAuthFailed from None
+            error_vars, _error_codes = await conn.sscp_read_variables(
+                sscp_vars, skip_known_errors=True
+            )
+
+        self._publish_values(
+            {
+                entity_id: sscp_var.val
+                for entity_id, sscp_var in zip(entity_ids, sscp_vars, strict=True)
+                if sscp_var.key not in error_vars
+            }
+        )
+
+    @callback
+    def _publish_values(self, values: dict[str, Any]) -> None:
+        """Update the entities of some freshly read values.
+
+        Pending values are kept, and small or frequent float changes are held.
+        """
+
+        if len(values) == 0:
+            return
+        now = datetime.now(tz=None)
+        for entity_id, value in values.items():
+            if entity_id in self.pending:
+                continue
+            self.read_times[entity_id] = now
+            if entity_id in self.data and self._hold_value(
+                entity_id, self.data[entity_id], value, now
+            ):
+                continue
+            self._set_value(entity_id, value)
+            self.read_times[entity_id] = now
+            self.publish_times[entity_id] = now
+        self.async_update_listeners()
+
+    def _watch_variables(self) -> list[sscp_variable] | None:
+        """Return the watched variables, if only they need to be read."""
+
+        if len(self.watch) == 0 or self.full_read_time is None or self.stale:
+            return None
+        # Fast polling (after writes) and pending values always read everything
+        if self.update_interval.seconds < self.scan_interval or len(self.pending) > 0:
+            return None
+        if datetime.now(tz=None) - self.full_read_time > timedelta(
+            seconds=self.watch_max_age
+        ):
+            return None
+
+        options = self.index.options
+        return [
+            sscp_variable(
+                uid=options[entity_id]["uid"],
+                offset=options[entity_id]["offset"],
+                length=options[entity_id]["length"],
+                type=options[entity_id]["type"],
+            )
+            for entity_id in self.watch
+            if "uid" in options.get(entity_id, {})
+        ]
+
+    async def _read_watch_variables(
+        self, conn: sscp_connection, watch_vars: list[sscp_variable]
+    ) -> bool:
+        """Read the watched variables.
+
+        Returns True if they are all unchanged, so that nothing else needs to be read.
+        Can raise exceptions from read().
+        """
+
+        error_vars, _error_codes = await conn.sscp_read_variables(
+            watch_vars, skip_known_errors=True
+        )
+        for sscp_var in watch_vars:
+            entity_id = (
+                str(sscp_var.uid) + "-" + str(sscp_var.offset) + "-" + str(sscp_var.length)
+            )
+            if sscp_var.key in error_vars or entity_id not in self.data:
+                return False
+            if self.data[entity_id] != sscp_var.val and not self._hold_value(
+                entity_id, self.data[entity_id], sscp_var.val, datetime.now(tz=None)
+            ):
+                _LOGGER.debug("Watched value changed: %s", entity_id)
+                return False
+        return len(watch_vars) > 0
+
+    @callback
+    def _set_pending(self, sscp_var: sscp_variable) -> dict[str, Any]:
+        """Show the value to be written, keeping the last confirmed value."""
+
+        entity_id = (
+            str(sscp_var.uid) + "-" + str(sscp_var.offset) + "-" + str(sscp_var.length)
+        )
+        old = self.pending.pop(entity_id, None)
+        if old is not None:
+            old["cancel"]()
+            confirmed = old["confirmed"]
+        else:
+            confirmed = self.data.get(entity_id)
+
+        record: dict[str, Any] = {
+            "entity_id": entity_id,
+            "raw": sscp_var.raw,
+            "confirmed": confirmed,
+            "written": False,
+        }
+        record["cancel"] = async_call_later(
+            self.hass, PENDING_TIMEOUT, partial(self._pending_timeout, record)
+        )
+        self.pending[entity_id] = record
+        self._count_write(entity_id)
+        self._set_value(entity_id, sscp_var.val)
+        self.async_update_listeners()
+        return record
+
+    @callback
+    def _pending_timeout(self, record: dict[str, Any], _now: datetime) -> None:
+        """Roll back a pending value that was not confirmed in time."""
+
+        if self.pending.get(record["entity_id"]) is not record:
+            return
+        _LOGGER.warning("Entity write: %s was not confirmed", record["entity_id"])
+        self._end_pending(record)
+        self.async_update_listeners()
+
+    @callback
+    def _end_pending(self, record: dict[str, Any], value: Any = None) -> None:
+        """Confirm a pending value with the value read back, or roll back to the last confirmed value.
+
+        A newer write of the same value is left pending.
+        """
+
+        entity_id = record["entity_id"]
+        if self.pending.get(entity_id) is not record:
+            return
+        del self.pending[entity_id]
+        record["cancel"]()
+        self._count_write(entity_id)
+        if value is not None:
+            self._set_value(entity_id, value)
+            self.read_times[entity_id] = datetime.now(tz=None)
+        else:
+            self._set_value(entity_id, record["confirmed"])
+
+    @callback
+    def _count_write(self, entity_id: str) -> None:
+        """Count a write showing, confirming or rolling back a value."""
+
+        self.write_count += 1
+        self.write_counts[entity_id] = self.write_count
+
+    @callback
+    def _set_value(self, entity_id: str, value: Any) -> None:
+        """Change a single value, without marking it as read."""
+
+        if value is None:
+            if self.data.pop(entity_id, None) is None:
+                return
+        elif self.data.get(entity_id) == value:
+            return
+        else:
+            self.data[entity_id] = value
+        self.read_times.pop(entity_id, None)
+        self.generations[entity_id] = self.generations.get(entity_id, 0) + 1
+
+    def get_cached(self, entity_id: str, max_age: timedelta) -> Any | None:
+        """Return a cached value if it was read recently enough."""
+
+        read_time = self.read_times.get(entity_id)
+        if read_time is None or datetime.now(tz=None) - read_time > max_age:
+            return None
+        return self.data.get(entity_id)
+
+
+def create_session(config_entry: ConfigEntry) -> sscp_session:
+    """Create a session (and its connection) for a config entry.
+
+    Can raise ValueError if the connection configuration is incomplete.
+    """
+
+    conn = sscp_connection(
+        name=config_entry.data[CONF_CONNECTION_NAME],
+        ip_address=config_entry.data[CONF_IP_ADDRESS],
+        port=config_entry.data[CONF_PORT],
+        user_name=config_entry.data[CONF_USERNAME],
+        password=config_entry.data[CONF_PASSWORD],
+        sscp_address=config_entry.data[CONF_SSCP_ADDRESS],
+    )
+    polling = config_entry.options.get(OPT_POLLING, {})
+    return sscp_session(
+        conn,
+        keepalive=polling.get(OPT_KEEPALIVE, DEFAULT_KEEPALIVE),
+        idle_timeout=polling.get(OPT_IDLE_TIMEOUT, DEFAULT_IDLE_TIMEOUT),
+    )
@@ -0,0 +1,40 @@
+"""Diagnostics for the Domat SSCP integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_PASSWORD
+from homeassistant.core import HomeAssistant
+
+from .const import DATA_WARMUP, DOMAIN
+from .coordinator import DomatSSCPConfigEntry, DomatSSCPCoordinator
+from .sscp.sscp_const import SSCP_ERRORS
+from .warmup import DomatSSCPWarmup
+
+_TO_REDACT = {CONF_PASSWORD}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, config_entry: DomatSSCPConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+
+    coordinator: DomatSSCPCoordinator = config_entry.coordinator
+    warmup: DomatSSCPWarmup = hass.data[DOMAIN][DATA_WARMUP]
+    first_data = warmup.first_data_times.get(config_entry.entry_id)
+
+    return {
+        "data": async_redact_data(config_entry.data, _TO_REDACT),
+        "options": dict(config_entry.options),
+        "last_update_success": coordinator.last_update_success,
+        "stale": coordinator.stale,
+        "snapshot_time": coordinator.snapshot_time,
+        "first_data_seconds": first_data,
+        "error_codes": {
+            entity_id: f"0x{code:04x} ({SSCP_ERRORS.get(code, 'unknown')})"
+            for entity_id, code in coordinator.error_codes.items()
+        },
+        "pending": list(coordinator.pending),
+    }
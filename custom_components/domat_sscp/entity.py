@@ -0,0 +1,55 @@
+"""Base entity for the Domat SSCP integration."""
+
+from typing import Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .coordinator import DomatSSCPCoordinator
+
+
+class DomatSSCPEntity(CoordinatorEntity):
+    """Entity for one SSCP variable, using coordinator for updates."""
+
+    _attr_has_entity_name = True
+    _attr_entity_registry_enabled_default = True
+
+    def __init__(self, coordinator: DomatSSCPCoordinator, entity_id: str) -> None:
+        """Initialise the entity of a variable (uid-offset-length)."""
+
+        super().__init__(coordinator)
+
+        self.coordinator = coordinator
+        self._attr_unique_id = entity_id
+        self.generation = coordinator.generations.get(entity_id)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+
+        # Skip values that haven't changed
+        generation = self.coordinator.generations.get(self.unique_id)
+        if generation == self.generation:
+            return
+        self.generation = generation
+        self._update_from_coordinator()
+        self.async_write_ha_state()
+
+    def _update_from_coordinator(self) -> None:
+        """Update our value from the co-ordinator data."""
+
+    @property
+    def available(self) -> bool:
+        """Is state available?"""
+
+        if self.unique_id in self.coordinator.data:
+            return True
+        return False
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Flag values loaded from the last snapshot, until the first refresh."""
+
+        if self.coordinator.stale:
+            return {"stale": True}
+        return None
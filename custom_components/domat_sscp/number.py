@@ -10,14 +10,14 @@ from homeassistant.components.number import (
     NumberEntity,
 )
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import DomatSSCPConfigEntry
 from .const import DOMAIN
 from .coordinator import DomatSSCPCoordinator
+from .entity import DomatSSCPEntity
 
 # The co-ordinator is used to centralise the data updates
 PARALLEL_UPDATES = 0
@@ -39,28 +39,21 @@ async def async_setup_entry(
 
     # Add numbers (class) with their initialisation data
     numbers: list[NumberEntity] = []
-    for opt in config_entry.options:
-        if (
-            "entity" in config_entry.options[opt]
-            and config_entry.options[opt]["entity"] == Platform.NUMBER
-        ):
-            _LOGGER.debug("Adding number %s: %s", opt, config_entry.options[opt])
-            numbers.append(
-                DomatSSCPNumber(
-                    coordinator=coordinator,
-                    entity_id=opt,
-                    entity_data=config_entry.options[opt],
-                )
+    for opt, entity_data in coordinator.index.platform(Platform.NUMBER).items():
+        _LOGGER.debug("Adding number %s: %s", opt, entity_data)
+        numbers.append(
+            DomatSSCPNumber(
+                coordinator=coordinator,
+                entity_id=opt,
+                entity_data=entity_data,
             )
+        )
     async_add_entities(numbers)
 
 
-class DomatSSCPNumber(CoordinatorEntity, NumberEntity):
+class DomatSSCPNumber(DomatSSCPEntity, NumberEntity):
     """Number types for SSCP, using coordinator for updates."""
 
-    _attr_has_entity_name = True
-    _attr_entity_registry_enabled_default = True
-
     def __init__(
         self,
         coordinator: DomatSSCPCoordinator,
@@ -69,11 +62,9 @@ class DomatSSCPNumber(CoordinatorEntity, NumberEntity):
     ) -> None:
         """Initialise a number with provided data."""
 
-        super().__init__(coordinator)
+        super().__init__(coordinator, entity_id)
 
         # Entity-specific values
-        self.coordinator = coordinator
-        self._attr_unique_id = entity_id
         if "name" in entity_data:
             self._attr_name = entity_data["name"]
         if "icon" in entity_data:
@@ -99,12 +90,10 @@ class DomatSSCPNumber(CoordinatorEntity, NumberEntity):
         self.sscp_type = entity_data["type"]
         _LOGGER.debug("Initialised new %s with: %s", entity_id, entity_data)
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
+    def _update_from_coordinator(self) -> None:
+        """Update our value from the co-ordinator data."""
 
         self._attr_native_value = self._update_value()
-        self.async_write_ha_state()
 
     @property
     def native_max_value(self) -> float:
@@ -130,14 +119,6 @@ class DomatSSCPNumber(CoordinatorEntity, NumberEntity):
 
         return self._attr_native_value
 
-    @property
-    def available(self) -> bool:
-        """Is state available?"""
-
-        if self.unique_id in self.coordinator.data:
-            return True
-        return False
-
     def set_native_value(self, value: float) -> None:
         """Set the value using the co-ordinator function."""
 
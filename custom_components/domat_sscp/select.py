@@ -5,14 +5,14 @@ from typing import Any
 
 from homeassistant.components.select import SelectEntity
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import DomatSSCPConfigEntry
 from .const import DOMAIN
 from .coordinator import DomatSSCPCoordinator
+from .entity import DomatSSCPEntity
 
 # The co-ordinator is used to centralise the data updates
 PARALLEL_UPDATES = 0
@@ -34,28 +34,21 @@ async def async_setup_entry(
 
     # Add selects (class) with their initialisation data
     selects: list[SelectEntity] = []
-    for opt in config_entry.options:
-        if (
-            "entity" in config_entry.options[opt]
-            and config_entry.options[opt]["entity"] == Platform.SELECT
-        ):
-            _LOGGER.debug("Adding select %s: %s", opt, config_entry.options[opt])
-            selects.append(
-                DomatSSCPSelect(
-                    coordinator=coordinator,
-                    entity_id=opt,
-                    entity_data=config_entry.options[opt],
-                )
+    for opt, entity_data in coordinator.index.platform(Platform.SELECT).items():
+        _LOGGER.debug("Adding select %s: %s", opt, entity_data)
+        selects.append(
+            DomatSSCPSelect(
+                coordinator=coordinator,
+                entity_id=opt,
+                entity_data=entity_data,
             )
+        )
     async_add_entities(selects)
 
 
-class DomatSSCPSelect(CoordinatorEntity, SelectEntity):
+class DomatSSCPSelect(DomatSSCPEntity, SelectEntity):
     """Select types for SSCP, using coordinator for updates."""
 
-    _attr_has_entity_name = True
-    _attr_entity_registry_enabled_default = True
-
     def __init__(
         self,
         coordinator: DomatSSCPCoordinator,
@@ -64,11 +57,9 @@ class DomatSSCPSelect(CoordinatorEntity, SelectEntity):
     ) -> None:
         """Initialise a select with provided data."""
 
-        super().__init__(coordinator)
+        super().__init__(coordinator, entity_id)
 
         # Entity-specific values
-        self.coordinator = coordinator
-        self._attr_unique_id = entity_id
         if "name" in entity_data:
             self._attr_name = entity_data["name"]
         if "icon" in entity_data:
@@ -91,12 +82,10 @@ class DomatSSCPSelect(CoordinatorEntity, SelectEntity):
         self.sscp_type = entity_data["type"]
         _LOGGER.debug("Initialised new %s with: %s", entity_id, entity_data)
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
+    def _update_from_coordinator(self) -> None:
+        """Update our value from the co-ordinator data."""
 
         self._attr_current_option = self._update_option()
-        self.async_write_ha_state()
 
     @property
     def options(self) -> list[str]:
@@ -110,14 +99,6 @@ class DomatSSCPSelect(CoordinatorEntity, SelectEntity):
 
         return self._attr_current_option
 
-    @property
-    def available(self) -> bool:
-        """Is state available?"""
-
-        if self.unique_id in self.coordinator.data:
-            return True
-        return False
-
     def select_option(self, option: str) -> None:
         """Set the option using the co-ordinator function."""
 
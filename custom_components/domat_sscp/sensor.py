@@ -5,15 +5,15 @@ from typing import Any
 
 from homeassistant.components.sensor import SensorDeviceClass, SensorEntity
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 from homeassistant.helpers.typing import StateType
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import DomatSSCPConfigEntry
 from .const import DOMAIN
 from .coordinator import DomatSSCPCoordinator
+from .entity import DomatSSCPEntity
 
 # The co-ordinator is used to centralise the data updates
 PARALLEL_UPDATES = 0
@@ -35,28 +35,21 @@ async def async_setup_entry(
 
     # Add sensors (class) with their initialisation data
     sensors: list[SensorEntity] = []
-    for opt in config_entry.options:
-        if (
-            "entity" in config_entry.options[opt]
-            and config_entry.options[opt]["entity"] == Platform.SENSOR
-        ):
-            _LOGGER.debug("Adding sensor %s: %s", opt, config_entry.options[opt])
-            sensors.append(
-                DomatSSCPSensor(
-                    coordinator=coordinator,
-                    entity_id=opt,
-                    entity_data=config_entry.options[opt],
-                )
+    for opt, entity_data in coordinator.index.platform(Platform.SENSOR).items():
+        _LOGGER.debug("Adding sensor %s: %s", opt, entity_data)
+        sensors.append(
+            DomatSSCPSensor(
+                coordinator=coordinator,
+                entity_id=opt,
+                entity_data=entity_data,
             )
+        )
     async_add_entities(sensors)
 
 
-class DomatSSCPSensor(CoordinatorEntity, SensorEntity):
+class DomatSSCPSensor(DomatSSCPEntity, SensorEntity):
     """Sensor types for SSCP, using coordinator for updates."""
 
-    _attr_has_entity_name = True
-    _attr_entity_registry_enabled_default = True
-
     def __init__(
         self,
         coordinator: DomatSSCPCoordinator,
@@ -65,11 +58,9 @@ class DomatSSCPSensor(CoordinatorEntity, SensorEntity):
     ) -> None:
         """Initialise a sensor with provided data."""
 
-        super().__init__(coordinator)
+        super().__init__(coordinator, entity_id)
 
         # Entity-specific values
-        self.coordinator = coordinator
-        self._attr_unique_id = entity_id
         if "name" in entity_data:
             self._attr_name = entity_data["name"]
         if "icon" in entity_data:
@@ -95,12 +86,10 @@ class DomatSSCPSensor(CoordinatorEntity, SensorEntity):
         )
         _LOGGER.debug("Initialised new %s with: %s", entity_id, entity_data)
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
+    def _update_from_coordinator(self) -> None:
+        """Update our value from the co-ordinator data."""
 
         self.value = self._update_value()
-        self.async_write_ha_state()
 
     @property
     def native_value(self) -> StateType | float | None:
@@ -108,14 +97,6 @@ class DomatSSCPSensor(CoordinatorEntity, SensorEntity):
 
         return self.value
 
-    @property
-    def available(self) -> bool:
-        """Is state available?"""
-
-        if self.unique_id in self.coordinator.data:
-            return True
-        return False
-
     def _update_value(self) -> float | None:
         """Retrieve our value from the co-ordinator."""
 
@@ -0,0 +1,121 @@
+"""Sessions shared between config entries for the Domat SSCP integration."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+import logging
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_IP_ADDRESS, CONF_PORT, CONF_USERNAME
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import CONF_SSCP_ADDRESS, IDLE_CHECK_INTERVAL
+from .coordinator import create_session
+from .sscp.sscp_session import sscp_session
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class DomatSSCPSessions:
+    """Sessions, shared by config entries for the same server/PLC, SSCP address and user.
+
+    Config entries for the same controller share its session, so that their requests
+    are arbitrated instead of racing each other.
+    Sessions stay logged in between polls: idle sessions are checked periodically,
+    to keep them alive or log them out. A session uses the idle options of its first entry.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Start without sessions."""
+
+        self.hass = hass
+        self._sessions: dict[tuple[str, int, int, str], sscp_session] = {}
+        # Config entry ID's using each session
+        self._users: dict[tuple[str, int, int, str], set[str]] = {}
+        self._idle_unsub: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_acquire(self, entry: ConfigEntry) -> sscp_session:
+        """Return the session for a config entry, creating it on first use.
+
+        Acquiring again for the same config entry returns the same session.
+        Can raise ValueError if the connection configuration is incomplete.
+        """
+
+        key = _session_key(entry)
+        session = self._sessions.get(key)
+        if session is None:
+            session = create_session(entry)
+            self._sessions[key] = session
+            self._users[key] = set()
+            if self._idle_unsub is None:
+                self._idle_unsub = async_track_time_interval(
+                    self.hass,
+                    self._async_check_idle,
+                    timedelta(seconds=IDLE_CHECK_INTERVAL),
+                    name="Domat SSCP idle sessions",
+                    cancel_on_shutdown=True,
+                )
+        self._users[key].add(entry.entry_id)
+        _LOGGER.debug("Session %s users: %s", key, self._users[key])
+        return session
+
+    @callback
+    def async_release(self, entry: ConfigEntry) -> None:
+        """A config entry has finished with its session: forget it after the last user."""
+
+        key = _session_key(entry)
+        users = self._users.get(key)
+        if users is None:
+            return
+        users.discard(entry.entry_id)
+        _LOGGER.debug("Session %s users: %s", key, users)
+        if len(users) == 0:
+            del self._users[key]
+            session = self._sessions.pop(key)
+            self.hass.async_create_background_task(
+                session.close(), name=f"Domat SSCP {key[0]} logout"
+            )
+            if len(self._sessions) == 0 and self._idle_unsub is not None:
+                self._idle_unsub()
+                self._idle_unsub = None
+
+    async def _async_check_idle(self, _now: datetime) -> None:
+        """Keep idle sessions alive, or log them out.
+
+        Sessions are checked concurrently, so that an unreachable server/PLC doesn't
+        hold up the others.
+        """
+
+        sessions = list(self._sessions.values())
+        results = await asyncio.gather(
+            *(session.check_idle() for session in sessions), return_exceptions=True
+        )
+        for session, result in zip(sessions, results, strict=True):
+            if isinstance(result, Exception):
+                _LOGGER.warning("Idle check failed for %s: %s", session.conn.name, result)
+
+    async def async_close(self, _event: Event | None = None) -> None:
+        """Log out all sessions (when Home Assistant stops)."""
+
+        if self._idle_unsub is not None:
+            self._idle_unsub()
+            self._idle_unsub = None
+        for session in list(self._sessions.values()):
+            try:
+                await session.close()
+            except (TimeoutError, ValueError, OSError) as e:
+                _LOGGER.debug("Logout failed: %s", e)
+
+
+def _session_key(entry: ConfigEntry) -> tuple[str, int, int, str]:
+    """Return the key of a config entry's session."""
+
+    return (
+        entry.data[CONF_IP_ADDRESS],
+        int(entry.data[CONF_PORT]),
+        int(entry.data[CONF_SSCP_ADDRESS]),
+        entry.data[CONF_USERNAME],
+    )
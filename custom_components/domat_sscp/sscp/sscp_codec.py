@@ -0,0 +1,102 @@
+"""SSCP (Shark Slave Communications Protocol) variable type codecs.
+
+See Also:
+  https://kb.mervis.info/lib/exe/fetch.php/cs:mervis-ide:sharkprotocolspecification_user_2017_05_30.pdf
+"""
+
+from functools import lru_cache
+import struct
+from typing import Any
+
+from .sscp_const import SSCP_DATA_ORDER, SSCP_STRUCT_ORDER
+
+
+class sscp_codec:
+    """SSCP Codec.
+
+    Converts the raw values of one variable type to and from values, with a precompiled struct.
+    Raw values with an unexpected length are converted as (signed or unsigned) integers.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        format: str | None,
+        is_float: bool = False,
+        is_raw: bool = False,
+        numeric: bool = True,
+    ) -> None:
+        """Configure the codec for a type, with its struct format character."""
+
+        self.name = name
+        self.format = format
+        if format is not None:
+            self.struct = struct.Struct(SSCP_STRUCT_ORDER + format)
+            self.size = self.struct.size
+        else:
+            self.struct = None
+            self.size = None
+        self.signed = format in {"b", "h", "i", "q"}
+        self.is_float = is_float
+        # Raw values are not converted
+        self.is_raw = is_raw
+        # Shown as a number (or state), otherwise as hex
+        self.numeric = numeric
+
+    def decode(self, raw: bytes) -> Any:
+        """Return the value of a raw value."""
+
+        if self.is_raw:
+            return raw
+        if self.struct is not None and len(raw) == self.size:
+            return self.struct.unpack(raw)[0]
+        return int.from_bytes(raw, SSCP_DATA_ORDER, signed=self.signed)
+
+    def encode(self, val: Any, length: int) -> bytes:
+        """Return the raw value (of the given length) of a value.
+
+        Can raise OverflowError or struct.error if the value doesn't fit.
+        """
+
+        if self.struct is not None and length == self.size:
+            return self.struct.pack(val)
+        return int(val).to_bytes(length, SSCP_DATA_ORDER, signed=self.signed)
+
+
+# Codecs for the Mervis variable types, by SSCP type ID
+_codecs: dict[int, sscp_codec] = {
+    0: sscp_codec("BOOL", "B"),
+    1: sscp_codec("BYTE", "B"),
+    2: sscp_codec("WORD", "H"),
+    3: sscp_codec("DWORD", "I"),
+    4: sscp_codec("LWORD", "Q"),
+    5: sscp_codec("SINT", "b"),
+    6: sscp_codec("INT", "h"),
+    7: sscp_codec("DINT", "i"),
+    8: sscp_codec("LINT", "q"),
+    9: sscp_codec("USINT", "B"),
+    10: sscp_codec("UINT", "H"),
+    11: sscp_codec("UDINT", "I"),
+    12: sscp_codec("ULINT", "Q"),
+    13: sscp_codec("REAL", "f", is_float=True),
+    14: sscp_codec("LREAL", "d", is_float=True),
+    15: sscp_codec("TIME", "i"),
+    18: sscp_codec("DT", "Q", numeric=False),
+    64: sscp_codec("RAW", None, is_raw=True, numeric=False),
+}
+
+# Unknown types are converted as unsigned integers of any length
+unknown_codec = sscp_codec("UNKNOWN", None, numeric=False)
+
+
+def get_codec(type: int) -> sscp_codec | None:
+    """Return the codec for a type, or None for an unknown type."""
+
+    return _codecs.get(type)
+
+
+@lru_cache(maxsize=256)
+def frame_struct(layout: tuple[str, ...]) -> struct.Struct:
+    """Return the (cached) struct for a reply frame, from the layouts of its variables."""
+
+    return struct.Struct(SSCP_STRUCT_ORDER + "".join(layout))
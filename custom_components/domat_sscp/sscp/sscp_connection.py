@@ -4,13 +4,13 @@ See Also:
   https://kb.mervis.info/lib/exe/fetch.php/cs:mervis-ide:sharkprotocolspecification_user_2017_05_30.pdf
 """
 
-import asyncio
-from errno import errorcode
+from collections.abc import AsyncIterator, Awaitable, Callable
 from hashlib import md5
 import logging
-import select
 import socket
+import time
 
+from .sscp_codec import frame_struct
 from .sscp_const import (
     SSCP_DATA_MAX_VAR,
     SSCP_DATA_ORDER,
@@ -18,6 +18,7 @@ from .sscp_const import (
     SSCP_DATALEN_START,
     SSCP_ERROR_CODE_END,
     SSCP_ERROR_CODE_START,
+    SSCP_ERROR_RECHECK,
     SSCP_ERROR_VARS_END,
     SSCP_ERROR_VARS_START,
     SSCP_ERRORS,
@@ -36,30 +37,39 @@ from .sscp_const import (
     SSCP_INFO_VERSION,
     SSCP_INFO_VERSION_LEN,
     SSCP_LOGIN_REQUEST,
+    SSCP_LOGIN_SUCCESS,
     SSCP_LOGOUT_DATA_LEN,
     SSCP_LOGOUT_REQUEST,
     SSCP_MAXDATA_END,
     SSCP_MAXDATA_START,
+    SSCP_PROBE_LENGTHS,
     SSCP_PROTOCOL_VERSION,
     SSCP_READ_DATA_FLAGS,
     SSCP_READ_DATA_REQUEST,
     SSCP_READ_DATA_SUCCESS,
+    SSCP_RECV_CEILING,
+    SSCP_RECV_LIMIT,
     SSCP_RECV_MAX,
-    SSCP_RECV_MAX_BYTES,
     SSCP_STATUS_END,
     SSCP_STATUS_START,
-    SSCP_TIMEOUT_CONNECT,
-    SSCP_TIMEOUT_DATA,
     SSCP_VERSION_END,
     SSCP_VERSION_START,
     SSCP_WRITE_DATA_FLAGS,
     SSCP_WRITE_DATA_REQUEST,
     SSCP_WRITE_DATA_SUCCESS,
 )
+from .sscp_transport import sscp_transport
 from .sscp_variable import sscp_variable
 
 _LOGGER = logging.getLogger(__name__)
 
+# Negotiated max. size of received data, per PLC serial number
+_recv_max_cache: dict[str, int] = {}
+
+
+class sscp_login_refused(ValueError):
+    """The server/PLC refused the login (e.g. incorrect credentials)."""
+
 
 class sscp_connection:
     """SSCP Connection.
@@ -76,10 +86,12 @@ class sscp_connection:
         sscp_address: int,
         password: str | None = None,
         md5_hash: str | None = None,
+        recv_ceiling: int = SSCP_RECV_CEILING,
     ) -> None:
         """Configure the SSCP connection with individual parameters.
 
         Either a password or an MD5 hash can be passed in.
+        The max. size of received data is negotiated up to recv_ceiling.
         """
 
         self.name = name
@@ -104,11 +116,17 @@ class sscp_connection:
         self.md5_len = len(self.md5_bytes).to_bytes(1, SSCP_DATA_ORDER)
         self.addr_byte = self.sscp_address.to_bytes(1, SSCP_DATA_ORDER)
 
-        self.socket = None
-        self.sockfd = 0
+        self.transport: sscp_transport | None = None
+        # The transport connection that we logged in on
+        self._connects = 0
         self.send_max = 0
+        self.recv_max = SSCP_RECV_MAX
+        self.recv_ceiling = min(recv_ceiling, SSCP_RECV_LIMIT)
+        self.negotiated = False
         self.serial = None
         self.platform = None
+        # Variables (uid, offset, length) with errors: (error code, recheck time)
+        self.known_errors: dict[tuple[int, int, int], tuple[int, float]] = {}
 
     @classmethod
     def from_yaml(cls, yaml):
@@ -141,54 +159,25 @@ class sscp_connection:
     async def login(self) -> None:
         """Log in to the SSCP server/PLC.
 
-        Create a socket connection to the server.
+        Create a socket connection to the server, or share an existing one.
         Use the connection parameters to log in.
         Can raise ConnectionError, OSError, or exceptions from sendrecv().
         Can raise TimeoutError if the credentials are incorrect.
+        Can raise sscp_login_refused (a ValueError) if the login is refused.
         """
 
-        self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.socket.settimeout(SSCP_TIMEOUT_CONNECT)
-        self.socket.setblocking(False)
-        self.sockfd = self.socket.fileno()
+        # Share the socket connection with other logins to the server
+        if self.transport is None:
+            self.transport = sscp_transport.acquire(self.ip_address, self.port)
         try:
-            self.socket.connect((self.ip_address, self.port))
-        except ConnectionError as e:
-            _LOGGER.error("Login: Connect failed: %s", e)
-            if self.socket is not None:
-                self.socket.close()
-                self.socket = None
-            raise ConnectionError from e
-        except OSError as e:
-            if e.errno != 115:  # Operation in progress
-                _LOGGER.error("Login: Connect failed: %s", e)
-                if self.socket is not None:
-                    self.socket.close()
-                    self.socket = None
-                raise OSError from e
-        # Wait for the socket to connect, or timeout
-        t = 0
-        while True:
-            if self.socket is None:
-                _LOGGER.error("Socket connect failed")
-                raise ConnectionError("Socket connect failed")
-            stat = self.socket.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
-            if stat != 0:
-                _LOGGER.error("Login: connect failed: %s", errorcode[stat])
-                raise ConnectionError(errorcode[stat])
-            _rlist, wlist, _xlist = select.select([], [self.sockfd], [], 0)
-            if len(wlist) == 0:
-                await asyncio.sleep(1)
-                t += 1
-                if t == SSCP_TIMEOUT_CONNECT:
-                    _LOGGER.error("Socket connect timeout")
-                    raise ConnectionError("Socket connect timeout")
-            else:
-                break
+            await self.transport.connect()
+        except OSError:
+            self._release()
+            raise
 
         data = bytearray()
         data += SSCP_PROTOCOL_VERSION
-        data += SSCP_RECV_MAX_BYTES
+        data += self.recv_max.to_bytes(2, SSCP_DATA_ORDER)
         data += self.user_len
         data += self.user_enc
         data += self.md5_len
@@ -202,12 +191,22 @@ class sscp_connection:
         request += data
 
         # Pass exceptions back to our caller
-        reply = await self._sscp_sendrecv(request, "Login")
+        try:
+            reply = await self.transport.sendrecv(request, self.recv_max, "Login")
+        except (TimeoutError, ValueError, OSError):
+            self._release()
+            raise
         if len(reply) == 0:
-            if self.socket is not None:
-                self.socket.close()
-                self.socket = None
+            self._release()
             raise TimeoutError("Login timed out")
+        if reply[SSCP_STATUS_START:SSCP_STATUS_END] != SSCP_LOGIN_SUCCESS:
+            _LOGGER.error(
+                "Login: refused, err 0x%s",
+                reply[SSCP_ERROR_CODE_START:SSCP_ERROR_CODE_END].hex(),
+            )
+            self._release()
+            raise sscp_login_refused("Login refused")
+        self._connects = self.transport.connects
 
         self.send_max = int.from_bytes(reply[SSCP_MAXDATA_START:SSCP_MAXDATA_END])
         _LOGGER.debug(
@@ -223,8 +222,72 @@ class sscp_connection:
         if len(reply) > SSCP_GUID_END:
             _LOGGER.debug("optional data: %s", reply[SSCP_GUID_END:].hex())
 
+    async def negotiate(self) -> None:
+        """Negotiate the largest max. size of received data, while logged in.
+
+        Uses the size that we found before for the same PLC (serial number).
+        Otherwise, logs in again with doubled sizes (up to our ceiling) until a login is refused,
+        and logs in again with the largest accepted size.
+        Negotiation is best-effort: after errors, we stay (or log in again) with the default size,
+        and negotiate again after the next login.
+        Can raise exceptions from login(), if we can't log in again.
+        """
+
+        if self.negotiated:
+            return
+        self.negotiated = True
+        try:
+            await self._negotiate()
+        except (TimeoutError, ValueError, OSError) as e:
+            _LOGGER.warning("Receive max. negotiation failed: %s", e)
+            self.negotiated = False
+            if self.socket is None:
+                self.recv_max = SSCP_RECV_MAX
+                await self.login()
+            _LOGGER.debug("Receive max. (default): %d", self.recv_max)
+
+    async def _negotiate(self) -> None:
+        """Negotiate the max. size of received data, see negotiate()."""
+
+        if self.serial is None:
+            await self.get_info()
+
+        cached = _recv_max_cache.get(self.serial)
+        if cached is not None:
+            if cached != self.recv_max:
+                await self.logout()
+                self.recv_max = cached
+                await self.login()
+            _LOGGER.debug("Receive max. (cached): %d", self.recv_max)
+            return
+
+        accepted = self.recv_max
+        while accepted < self.recv_ceiling:
+            self.recv_max = min(accepted * 2, self.recv_ceiling)
+            await self.logout()
+            try:
+                await self.login()
+            except (TimeoutError, ValueError, OSError) as e:
+                _LOGGER.debug("Receive max. %d refused: %s", self.recv_max, e)
+                self.recv_max = accepted
+                await self.login()
+                break
+            accepted = self.recv_max
+
+        _LOGGER.debug("Receive max. (negotiated): %d", self.recv_max)
+        _recv_max_cache[self.serial] = self.recv_max
+
     async def logout(self):
-        """Log out from the SSCP server/PLC."""
+        """Log out from the SSCP server/PLC.
+
+        A logout may close the socket connection, so only the last login to the server logs out.
+        """
+
+        if self.transport is None:
+            return
+        if self.socket is None or self.transport.users > 1:
+            self._release()
+            return
 
         request = bytearray()
         request += self.addr_byte
@@ -232,6 +295,25 @@ class sscp_connection:
         request += SSCP_LOGOUT_DATA_LEN
 
         await self._sscp_sendrecv(request, "Logout", close_after_send=True)
+        self._release()
+
+    @property
+    def socket(self) -> socket.socket | None:
+        """Return the socket that we are logged in with, or None."""
+
+        if self.transport is None or self.transport.connects != self._connects:
+            return None
+        return self.transport.socket
+
+    def _release(self) -> None:
+        """Stop using the socket connection, and close it if no one else is using it."""
+
+        if self.transport is None:
+            return
+        if self.transport.release():
+            self.transport.close()
+        self.transport = None
+        self._connects = 0
 
     async def get_info(self) -> None:
         """Get basic info about the SSCP server/PLC.
@@ -259,9 +341,6 @@ class sscp_connection:
         # Pass exceptions back to our caller
         reply = await self._sscp_sendrecv(request, "Info ")
         if len(reply) == 0:
-            if self.socket is not None:
-                self.socket.close()
-                self.socket = None
             raise TimeoutError("Info timed out")
 
         start = SSCP_INFO_SERIAL_START
@@ -287,47 +366,105 @@ class sscp_connection:
         if len(reply) > end:
             _LOGGER.debug("information: %s", reply[end:].hex())
 
-    async def sscp_read_variables(self, vars: list[sscp_variable]):
+    async def sscp_read_variables(
+        self,
+        vars: list[sscp_variable],
+        between_requests: Callable[[], Awaitable[None]] | None = None,
+        skip_known_errors: bool = False,
+    ) -> tuple[set[tuple[int, int, int]], dict[tuple[int, int, int], int]]:
         """Read variable(s) via the connection.
 
         Updates the raw values of the variables.
-        Retries the read if some of the variables have errors.
-        Returns a list of variables with errors and a list of the error codes
+        See sscp_read_frames().
+        Returns a set of variables (uid, offset, length) with errors and a dictionary of their error codes.
         Can raise exceptions from sendrecv().
         """
 
+        err_vars: set[tuple[int, int, int]] = set()
+        err_codes: dict[tuple[int, int, int], int] = {}
+        async for _frame in self.sscp_read_frames(
+            vars,
+            err_vars,
+            err_codes,
+            between_requests=between_requests,
+            skip_known_errors=skip_known_errors,
+        ):
+            pass
+        return err_vars, err_codes
+
+    async def sscp_read_frames(
+        self,
+        vars: list[sscp_variable],
+        err_vars: set[tuple[int, int, int]],
+        err_codes: dict[tuple[int, int, int], int],
+        between_requests: Callable[[], Awaitable[None]] | None = None,
+        skip_known_errors: bool = False,
+    ) -> AsyncIterator[list[sscp_variable]]:
+        """Read variable(s) via the connection, yielding the variables of each reply as it arrives.
+
+        Updates the raw values of the variables.
+        Retries the read of a request if some of its variables have errors.
+        With skip_known_errors (for polls), variables that the PLC reported as errors are
+        remembered, and not read again until they are due to be rechecked.
+        If the read needs several requests, between_requests() is awaited between them,
+        e.g. to let other users of a session send their requests.
+        Variables that were read in segments are yielded last, when all of their segments are read.
+        Adds variables (uid, offset, length) with errors to err_vars and their error codes to err_codes.
+        Can raise exceptions from sendrecv(): variables that were already yielded are valid.
+        """
+
+        # Skip variables with known errors, unless it's time to recheck them
+        if skip_known_errors:
+            now = time.monotonic()
+            read_vars: list[sscp_variable] = []
+            for var in vars:
+                known = self.known_errors.get(var.key)
+                if known is None:
+                    read_vars.append(var)
+                elif now < known[1]:
+                    err_vars.add(var.key)
+                    err_codes[var.key] = known[0]
+                else:
+                    _LOGGER.debug("Rechecking variable: %s", var.key)
+                    del self.known_errors[var.key]
+                    read_vars.append(var)
+            vars = read_vars
+
         if len(vars) == 0:
-            return [], []
+            return
 
         _LOGGER.debug(
-            "Read limits: %d, %d, %d", self.send_max, SSCP_RECV_MAX, SSCP_DATA_MAX_VAR
+            "Read limits: %d, %d, %d", self.send_max, self.recv_max, SSCP_DATA_MAX_VAR
         )
         # Unclear if *_max include the data header or not, so reduce them in case
         send_max = self.send_max - SSCP_DATALEN_END
-        recv_max = SSCP_RECV_MAX - SSCP_DATALEN_END
+        recv_max = self.recv_max - SSCP_DATALEN_END
+
+        # Variables that don't fit in a reply are read in segments
+        vars, segments = _sscp_split_variables(vars, recv_max)
+        segment_ids = {id(segment) for _var, var_segments in segments for segment in var_segments}
 
         header = bytearray()
         header += self.addr_byte
         header += SSCP_READ_DATA_REQUEST
 
-        err_vars = []
-        err_codes = []
-
+        sent = False
         for reply_len_base, var_start, var_end in _sscp_read_variables_generator(
             vars=vars, send_max=send_max, recv_max=recv_max
         ):
             while True:
+                if sent and between_requests is not None:
+                    await between_requests()
+
                 # Build our request
                 data = bytearray()
                 data += SSCP_READ_DATA_FLAGS
                 reply_len = reply_len_base
                 for var in vars[var_start:var_end]:
-                    if var.uid in err_vars:
+                    if var.key in err_vars:
                         reply_len -= var.length
                     else:
-                        data += var.uid_bytes
-                        data += var.offset_bytes
-                        data += var.length_bytes
+                        data += var.address_bytes
 
                 # All variables have errors
                 if len(data) == len(SSCP_READ_DATA_FLAGS):
@@ -340,6 +477,7 @@ class sscp_connection:
 
                 # Pass exceptions back to our caller
                 reply = await self._sscp_sendrecv(request, prefix="Read")
+                sent = True
 
                 if reply[SSCP_STATUS_START:SSCP_STATUS_END] != SSCP_READ_DATA_SUCCESS:
                     err = int.from_bytes(
@@ -356,45 +494,205 @@ class sscp_connection:
                         err,
                         SSCP_ERRORS.get(err, "unknown"),
                     )
-                    # Add variables with errors to the error list
+                    # Add variables with errors to the error set
+                    # The bitmap only counts the variables in this request
                     i = 0
+                    new_errors = 0
                     for var in vars[var_start:var_end]:
-                        if var.uid in err_vars:
+                        if var.key in err_vars:
                             continue
                         if val & (1 << i) > 0:
-                            err_vars.append(var.uid)
-                            err_codes.append(err)
+                            self._add_error(
+                                var.key, err, err_vars, err_codes, remember=skip_known_errors
+                            )
+                            new_errors += 1
                         i += 1
 
-                    _LOGGER.error("Error variables: %s", err_vars)
-                    _LOGGER.error("Error codes: %s", err_codes)
+                    _LOGGER.error("Error variables: %s", err_codes)
+                    if new_errors == 0:
+                        # Don't retry forever if the PLC doesn't tell us which variables failed
+                        for var in vars[var_start:var_end]:
+                            if var.key not in err_vars:
+                                self._add_error(var.key, err, err_vars, err_codes)
+                        break
+                    # Rebuild and retry this request only
                     continue
 
                 data_len = int.from_bytes(
                     reply[SSCP_DATALEN_START:SSCP_DATALEN_END], SSCP_DATA_ORDER
                 )
                 if data_len != reply_len:
-                    # We didn't receive enough data, so mark remaining UID's as errors
+                    # We didn't receive enough data, so mark this request's variables as errors
                     _LOGGER.error("Read length mismatch: %d %d", data_len, reply_len)
-                    for var in vars[var_end:]:
-                        if var.uid not in err_vars:
-                            err_vars.append(var.uid)
-                            err_codes.append(0)
-                    return err_vars, err_codes
+                    for var in vars[var_start:var_end]:
+                        if var.key not in err_vars:
+                            self._add_error(var.key, 0, err_vars, err_codes)
+                    break
 
+                # Unpack the whole reply at once, with the struct for this frame's layout
+                frame = [var for var in vars[var_start:var_end] if var.key not in err_vars]
+                values = frame_struct(tuple(var.layout for var in frame)).unpack_from(
+                    reply, SSCP_DATALEN_END
+                )
+                _LOGGER.debug("Read %d variables", len(frame))
                 pos0 = SSCP_DATALEN_END
-                for var in vars[var_start:var_end]:
-                    if var.uid not in err_vars:
-                        pos1 = pos0 + var.length
-                        var.set_value(reply[pos0:pos1])
-                        pos0 = pos1
+                for var, val in zip(frame, values, strict=True):
+                    pos1 = pos0 + var.length
+                    var.set_unpacked(reply[pos0:pos1], val)
+                    pos0 = pos1
+                frame = [var for var in frame if id(var) not in segment_ids]
+                if len(frame) > 0:
+                    yield frame
                 break
 
-        return err_vars, err_codes
+        # Join the segments, or report the variable with the first segment error
+        joined: list[sscp_variable] = []
+        for var, var_segments in segments:
+            raw = bytearray()
+            for segment in var_segments:
+                remembered = self.known_errors.pop(segment.key, None) is not None
+                if segment.key in err_vars:
+                    err = err_codes.pop(segment.key)
+                    if var.key not in err_vars:
+                        self._add_error(var.key, err, err_vars, err_codes, remember=remembered)
+                else:
+                    raw += segment.raw
+                err_vars.discard(segment.key)
+            if var.key not in err_vars:
+                var.set_value(raw)
+                joined.append(var)
+        if len(joined) > 0:
+            yield joined
+
+    def _add_error(
+        self,
+        key: tuple[int, int, int],
+        err: int,
+        err_vars: set[tuple[int, int, int]],
+        err_codes: dict[tuple[int, int, int], int],
+        remember: bool = False,
+    ) -> None:
+        """Add a variable to the errors.
+
+        Only errors that the PLC reported for the variable should be remembered until they
+        are due to be rechecked, not failures of the whole request.
+        """
+
+        err_vars.add(key)
+        err_codes[key] = err
+        if remember:
+            self.known_errors[key] = (err, time.monotonic() + SSCP_ERROR_RECHECK)
+
+    async def sscp_probe_variables(
+        self, candidates: list[tuple[int, int, int]]
+    ) -> tuple[list[tuple[int, int, int]], dict[tuple[int, int, int], int]]:
+        """Probe which of the candidate (uid, offset, length) variables exist.
+
+        Packs as many candidates as possible into each read request.
+        When the PLC reports errors, the per-variable error bitmap classifies
+        every candidate in the request, so each request is only sent once.
+        If the PLC doesn't say which candidates failed, they are probed one at a time.
+        Returns a list of existing candidates and the error codes of missing candidates.
+        Can raise exceptions from sendrecv().
+        """
+
+        found: list[tuple[int, int, int]] = []
+        missing: dict[tuple[int, int, int], int] = {}
+        if len(candidates) == 0:
+            return found, missing
+
+        # Type 64 variables keep their raw value, which we don't need to convert
+        vars = [
+            sscp_variable(uid=uid, offset=offset, length=length, type=64)
+            for uid, offset, length in candidates
+        ]
+        send_max = self.send_max - SSCP_DATALEN_END
+        recv_max = self.recv_max - SSCP_DATALEN_END
+
+        unclassified: list[sscp_variable] = []
+        for _reply_len, var_start, var_end in _sscp_read_variables_generator(
+            vars=vars, send_max=send_max, recv_max=recv_max
+        ):
+            failed, err, val = await self._sscp_probe_request(vars[var_start:var_end])
+            if failed and val == 0 and var_end - var_start > 1:
+                unclassified.extend(vars[var_start:var_end])
+                continue
+            for i, var in enumerate(vars[var_start:var_end]):
+                if failed and (val == 0 or val & (1 << i) > 0):
+                    missing[var.key] = err
+                else:
+                    found.append(var.key)
+
+        for var in unclassified:
+            failed, err, _val = await self._sscp_probe_request([var])
+            if failed:
+                missing[var.key] = err
+            else:
+                found.append(var.key)
+
+        _LOGGER.debug("Probe found %d of %d variables", len(found), len(candidates))
+        return found, missing
+
+    async def _sscp_probe_request(
+        self, vars: list[sscp_variable]
+    ) -> tuple[bool, int, int]:
+        """Send one probe (read) request.
+
+        Returns whether the PLC replied with an error, the error code and the error bitmap.
+        Can raise exceptions from sendrecv().
+        """
+
+        data = bytearray()
+        data += SSCP_READ_DATA_FLAGS
+        for var in vars:
+            data += var.address_bytes
+
+        request = bytearray()
+        request += self.addr_byte
+        request += SSCP_READ_DATA_REQUEST
+        request += len(data).to_bytes(2, SSCP_DATA_ORDER)
+        request += data
 
-    async def sscp_write_variables(self, vars: list[sscp_variable]) -> None:
+        # Pass exceptions back to our caller
+        reply = await self._sscp_sendrecv(request, prefix="Probe")
+
+        if reply[SSCP_STATUS_START:SSCP_STATUS_END] == SSCP_READ_DATA_SUCCESS:
+            return False, 0, 0
+        err = int.from_bytes(
+            reply[SSCP_ERROR_CODE_START:SSCP_ERROR_CODE_END],
+            SSCP_DATA_ORDER,
+        )
+        val = int.from_bytes(
+            reply[SSCP_ERROR_VARS_START:SSCP_ERROR_VARS_END],
+            SSCP_DATA_ORDER,
+        )
+        return True, err, val
+
+    async def sscp_probe_uids(
+        self, uids: range | list[int], lengths: tuple[int, ...] = SSCP_PROBE_LENGTHS
+    ) -> dict[int, int]:
+        """Probe a range or list of UID's for existing variables.
+
+        Each UID is probed (at offset 0) with each of the lengths.
+        Returns a dictionary of existing UID's with the longest length that could be read.
+        Can raise exceptions from sendrecv().
+        """
+
+        candidates = [(uid, 0, length) for uid in uids for length in lengths]
+        found, _missing = await self.sscp_probe_variables(candidates)
+
+        uid_lengths: dict[int, int] = {}
+        for uid, _offset, length in found:
+            uid_lengths[uid] = max(length, uid_lengths.get(uid, 0))
+        return uid_lengths
+
+    async def sscp_write_variables(
+        self, vars: list[sscp_variable], segmented: bool = False
+    ) -> None:
         """Write variables via the connection.
 
+        If the variables don't fit in one request and segmented is True,
+        they are written one at a time, in segments if needed (see sscp_write_segmented()).
         Can raise exceptions from sendrecv() or if variables have errors.
         """
 
@@ -414,9 +712,7 @@ class sscp_connection:
         data += SSCP_WRITE_DATA_FLAGS
         data += len(vars).to_bytes(1)
         for var in vars:
-            data += var.uid_bytes
-            data += var.offset_bytes
-            data += var.length_bytes
+            data += var.address_bytes
         for var in vars:
             if var.raw is None:
                 msg = f"No value to write for: {var.uid}"
@@ -424,9 +720,16 @@ class sscp_connection:
             data += var.raw
         data_len = len(data)
         if data_len > send_max:
-            # Don't split the request here like we do for read, because we don't know which vars must be written together
-            msg = f"Data write too long: {data_len}"
-            raise ValueError(msg)
+            # Only split the request when asked, because we don't know which vars must be written together
+            if segmented is not True:
+                msg = f"Data write too long: {data_len}"
+                raise ValueError(msg)
+            for var in vars:
+                if _sscp_write_length(var) > send_max:
+                    await self.sscp_write_segmented(var)
+                else:
+                    await self.sscp_write_variables([var])
+            return
 
         request = bytearray()
         request += self.addr_byte
@@ -443,99 +746,134 @@ class sscp_connection:
             msg = msg + f"0x{reply[SSCP_ERROR_VARS_START:SSCP_ERROR_VARS_END].hex():8}"
             raise ValueError(msg)
 
+    async def sscp_write_segmented(self, var: sscp_variable) -> None:
+        """Write a long variable in segments (by offset), and read back each segment.
+
+        Segments are whole records (var.record_length) and are written from the first
+        segment, or from the last if var.write_descending is True.
+        Can raise exceptions from sendrecv().
+        Can raise ValueError if a segment fails, with the offsets of the segments already written.
+        """
+
+        if var.raw is None:
+            msg = f"No value to write for: {var.uid}"
+            raise ValueError(msg)
+
+        # Segments must fit in one request, and be read back in one reply
+        segment_max = min(
+            self.send_max - SSCP_DATALEN_END - _sscp_write_length(var) + var.length,
+            self.recv_max - SSCP_DATALEN_END - 1,
+        )
+        segment_max -= segment_max % var.record_length
+        if segment_max <= 0:
+            msg = f"Data write segment too short: {var.uid}"
+            raise ValueError(msg)
+        starts = list(range(0, var.length, segment_max))
+        if var.write_descending:
+            starts.reverse()
+        _LOGGER.debug("Writing %s in %d segments", var.key, len(starts))
+
+        written: list[int] = []
+        for start in starts:
+            segment = sscp_variable(
+                uid=var.uid,
+                offset=var.offset + start,
+                length=min(segment_max, var.length - start),
+                type=64,
+                perm="rw",
+            )
+            segment.raw = var.raw[start:start + segment.length]
+            check = sscp_variable(
+                uid=segment.uid, offset=segment.offset, length=segment.length, type=64
+            )
+            try:
+                await self.sscp_write_variables([segment])
+                err_vars, _err_codes = await self.sscp_read_variables([check])
+            except ValueError as e:
+                msg = f"Segmented write failed for {var.uid} at offset {segment.offset}, written offsets: {written}"
+                raise ValueError(msg) from e
+            if len(err_vars) > 0 or check.raw != segment.raw:
+                msg = f"Segmented write not verified for {var.uid} at offset {segment.offset}, written offsets: {written}"
+                raise ValueError(msg)
+            written.append(segment.offset)
+
     async def _sscp_sendrecv(
         self, request: bytearray, prefix="Socket", close_after_send=False
     ) -> bytearray:
-        """Send/receive data on the socket.
-
-        Ensure that socket is ready for write or read.
-        Ensure that we read enough data from the socket for a complete reply.
-        Handle socket errors.
-        Can raise ConnectionError or OSError if no data can be sent.
-        Can raise TimeoutError if no data can be received.
-        Can raise ValueError if unexpected data is received.
-        If close_after_send is True, no exceptions are raised and the socket is always closed.
+        """Send/receive data on our (logged in) socket.
+
+        If the socket connection was lost (e.g. while idle), logs in again and replays
+        the request once.
+        See sscp_transport.sendrecv().
         """
 
+        if close_after_send is True:
+            if self.socket is None:
+                return bytearray()
+            return await self.transport.sendrecv(
+                request, self.recv_max, prefix, close_after_send
+            )
+
         if self.socket is None:
-            if close_after_send is not True:
+            if self.transport is None:
                 _LOGGER.error("%s: send/recv without socket", prefix)
                 raise ConnectionError("Socket not writeable")
-            return bytearray()
+            _LOGGER.info("%s: connection lost, logging in again", prefix)
+            await self.login()
+            return await self.transport.sendrecv(request, self.recv_max, prefix)
 
-        # Write the request
         try:
-            _rlist, wlist, _xlist = select.select([], [self.sockfd], [], 0)
-            if len(wlist) == 0:
-                if self.socket is not None:
-                    self.socket.close()
-                    self.socket = None
-                if close_after_send is not True:
-                    _LOGGER.error("%s: socket not writeable", prefix)
-                    raise ConnectionError("Socket not writeable")
-                return bytearray()
+            return await self.transport.sendrecv(request, self.recv_max, prefix)
+        except (TimeoutError, OSError) as e:
+            if self.transport is None:
+                raise
+            _LOGGER.info("%s: connection lost (%s), logging in again and replaying", prefix, e)
+        await self.login()
+        return await self.transport.sendrecv(request, self.recv_max, prefix)
 
-            _LOGGER.debug("%s request: %s", prefix, request.hex())
-            self.socket.sendall(request)
-        except OSError as e:
-            if self.socket is not None:
-                self.socket.close()
-                self.socket = None
-            if close_after_send is not True:
-                _LOGGER.error("%s: send failed: %s", prefix, e)
-                raise OSError from e
-            return bytearray()
 
-        if close_after_send is True:
-            self.socket.close()
-            self.socket = None
-            return bytearray()
-
-        reply = bytearray()
-
-        # Read at least as far as the data length
-        t = 0
-        while len(reply) < SSCP_DATALEN_END:
-            rlist, _wlist, _xlist = select.select([self.sockfd], [], [], 0)
-            if len(rlist) > 0:
-                reply += self.socket.recv(SSCP_RECV_MAX - len(reply))
-            if len(reply) < SSCP_DATALEN_END:
-                await asyncio.sleep(1)
-                t += 1
-                if t >= SSCP_TIMEOUT_DATA:
-                    _LOGGER.error("%s: receive header timeout", prefix)
-                    if self.socket is not None:
-                        self.socket.close()
-                        self.socket = None
-                    raise TimeoutError("Receive header timeout")
-
-        data_len = int.from_bytes(
-            reply[SSCP_DATALEN_START:SSCP_DATALEN_END], SSCP_DATA_ORDER
-        )
-        if data_len > SSCP_RECV_MAX:
-            _LOGGER.error("%s: unexpected data received", prefix)
-            self.socket.close()
-            self.socket = None
-            raise ValueError("Unexpected data received")
-
-        # Read the rest of the data
-        t = 0
-        while len(reply) < SSCP_DATALEN_END + data_len:
-            rlist, _wlist, _xlist = select.select([self.sockfd], [], [], 0)
-            if len(rlist) > 0:
-                reply += self.socket.recv(SSCP_RECV_MAX - len(reply))
-            if len(reply) < SSCP_DATALEN_END + data_len:
-                await asyncio.sleep(1)
-                t += 1
-                if t >= SSCP_TIMEOUT_DATA:
-                    _LOGGER.error("%s: receive data timeout", prefix)
-                    if self.socket is not None:
-                        self.socket.close()
-                        self.socket = None
-                    raise TimeoutError("Receive data timeout")
-
-        _LOGGER.debug("%s reply: %s", prefix, reply.hex())
-        return reply
+def _sscp_write_length(var: sscp_variable) -> int:
+    """Return the length of the data to write one variable."""
+
+    return (
+        len(SSCP_WRITE_DATA_FLAGS)
+        + 1
+        + len(var.address_bytes)
+        + var.length
+    )
+
+
+def _sscp_split_variables(
+    vars: list[sscp_variable], recv_max: int
+) -> tuple[list[sscp_variable], list[tuple[sscp_variable, list[sscp_variable]]]]:
+    """Split variables that are too long for one reply into segments (by offset).
+
+    Returns the variables to read, with segments in place of long variables,
+    and a list of the long variables with their segments.
+    """
+
+    read_vars: list[sscp_variable] = []
+    segments: list[tuple[sscp_variable, list[sscp_variable]]] = []
+    # The reply length must be less than recv_max
+    segment_max = recv_max - 1
+    for var in vars:
+        if var.length <= segment_max:
+            read_vars.append(var)
+            continue
+        # Type 64 variables keep their raw value, which we join later
+        var_segments = [
+            sscp_variable(
+                uid=var.uid,
+                offset=var.offset + start,
+                length=min(segment_max, var.length - start),
+                type=64,
+            )
+            for start in range(0, var.length, segment_max)
+        ]
+        _LOGGER.debug("Reading %s in %d segments", var.key, len(var_segments))
+        read_vars.extend(var_segments)
+        segments.append((var, var_segments))
+    return read_vars, segments
 
 
 def _sscp_read_variables_generator(vars: sscp_variable, send_max: int, recv_max: int):
@@ -547,11 +885,7 @@ def _sscp_read_variables_generator(vars: sscp_variable, send_max: int, recv_max:
     request_len = len(SSCP_READ_DATA_FLAGS)
     uid_count = 0
     while var_end < len(vars):
-        var_len = (
-            len(vars[var_end].uid_bytes)
-            + len(vars[var_end].offset_bytes)
-            + len(vars[var_end].length_bytes)
-        )
+        var_len = len(vars[var_end].address_bytes)
         if (
             (reply_len + vars[var_end].length < recv_max)
             and (request_len + var_len < send_max)
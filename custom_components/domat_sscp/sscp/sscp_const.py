@@ -3,6 +3,7 @@
 # SSCP packet format constants
 # Wire endianness
 SSCP_DATA_ORDER = "big"
+SSCP_STRUCT_ORDER = ">"
 # Start and end bytes of received status
 SSCP_STATUS_START = 1
 SSCP_STATUS_END = 3
@@ -15,9 +16,14 @@ SSCP_LOGIN_REQUEST = bytes("\x01\x00", encoding="iso-8859-1")
 # Parameters we send
 # Version we offer
 SSCP_PROTOCOL_VERSION = bytes("\x01", encoding="iso-8859-1")
-# Max. size of received data (arbitrary value)
+# Max. size of received data (arbitrary value, known to work)
 SSCP_RECV_MAX = 2048
-SSCP_RECV_MAX_BYTES = SSCP_RECV_MAX.to_bytes(2, SSCP_DATA_ORDER)
+# Default ceiling when negotiating a larger max. size of received data
+SSCP_RECV_CEILING = 16384
+# Largest max. size of received data that we can send (2 bytes)
+SSCP_RECV_LIMIT = 65535
+# Login succesful
+SSCP_LOGIN_SUCCESS = bytes("\x81\x00", encoding="iso-8859-1")
 # Parameters we receive
 # Start and end bytes of received version
 SSCP_VERSION_START = 5
@@ -76,6 +82,12 @@ SSCP_ERROR_CODE_END = 9
 SSCP_ERROR_VARS_START = 9
 SSCP_ERROR_VARS_END = 17
 
+# Seconds before variables with read errors are read again
+SSCP_ERROR_RECHECK = 3600
+
+# Lengths to try when probing for unknown variables (bool, 2-byte, 4-byte, 8-byte)
+SSCP_PROBE_LENGTHS = (1, 2, 4, 8)
+
 # Error codes (not all)
 SSCP_ERRORS = {
     0x0103: "No Such Variable",
@@ -85,14 +97,6 @@ SSCP_ERRORS = {
     0x0112: "Size Mismatch",
 }
 
-# IEEE754 constants
-IEEE754_SIGN = 0x80000000
-IEEE754_EXPONENT = 0x7F800000
-IEEE754_SIGNIFICAND = 0x007FFFFF
-IEEE754_MAXIMUM_BITS = 32
-IEEE754_EXPONENT_SHIFT = 23
-IEEE754_EXPONENT_BIAS = 127
-IEEE754_SIGNIFICAND_LENGTH = IEEE754_EXPONENT_SHIFT
 
 # Schedule constants
 SCHEDULE_OFF = bytes("\x00\x00", encoding="iso-8859-1")
@@ -139,6 +143,21 @@ OFF_NAME_CS = "vypnuté"
 WEEKDAYS_NAME_CS = ["po", "út", "st", "čt", "pá", "so", "ne"]
 
 
+# Session priorities (lowest first)
+SSCP_PRIORITY_WRITE = 0
+SSCP_PRIORITY_READ = 1
+SSCP_PRIORITY_POLL = 2
+SSCP_PRIORITY_IDLE = 3
+
 # Connection timeout defaults
 SSCP_TIMEOUT_CONNECT = 30
 SSCP_TIMEOUT_DATA = 10
+
+# Idle session defaults (seconds, 0 disables)
+SSCP_KEEPALIVE = 60
+SSCP_IDLE_TIMEOUT = 900
+
+# TCP keepalive (seconds idle, seconds between probes, probes)
+SSCP_TCP_KEEPIDLE = 60
+SSCP_TCP_KEEPINTVL = 10
+SSCP_TCP_KEEPCNT = 3
@@ -626,6 +626,26 @@ class sscp_schedule_exceptions(sscp_variable):
         return self.add_event(start=new_start, end=new_end, on=new_on)
 
 
+def schedule_write_descending(
+    old: bytearray | None, new: bytearray, record_length: int
+) -> bool:
+    """Should a schedule that is written in segments be written from the last record?
+
+    Until a segmented write finishes, the PLC has a mix of old and new records.
+    If the first changed record moves earlier, writing from the first record keeps
+    the records in order, otherwise writing from the last record does.
+    """
+
+    if old is None or len(old) != len(new):
+        return False
+    for start in range(0, len(new), record_length):
+        old_record = old[start:start + record_length]
+        new_record = new[start:start + record_length]
+        if old_record != new_record:
+            return new_record > old_record
+    return False
+
+
 def _scheduler_base_hex_to_time(byte2) -> list[int]:
     """Convert scheduler base hex to time."""
 
@@ -0,0 +1,174 @@
+"""SSCP (Shark Slave Communications Protocol) session arbitration.
+
+See Also:
+  https://kb.mervis.info/lib/exe/fetch.php/cs:mervis-ide:sharkprotocolspecification_user_2017_05_30.pdf
+"""
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+import heapq
+import itertools
+import logging
+import time
+
+from .sscp_connection import sscp_connection
+from .sscp_const import SSCP_IDLE_TIMEOUT, SSCP_KEEPALIVE, SSCP_PRIORITY_IDLE
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class sscp_session:
+    """SSCP Session.
+
+    Shares one connection between polling, writes and other users.
+    The connection is granted to one user at a time, in priority order (lowest first),
+    and in request order for equal priorities.
+    Users only wait when the connection is in use, and never sleep.
+    The connection stays logged in between users, until it is idle for idle_timeout seconds.
+    While idle, a (cheap) info request is sent every keepalive seconds.
+    """
+
+    def __init__(
+        self,
+        conn: sscp_connection,
+        keepalive: int = SSCP_KEEPALIVE,
+        idle_timeout: int = SSCP_IDLE_TIMEOUT,
+    ) -> None:
+        """Configure the session for a connection."""
+
+        self.conn = conn
+        self.keepalive = keepalive
+        self.idle_timeout = idle_timeout
+        self.last_used = time.monotonic()
+        self._last_keepalive = 0.0
+        self.busy = False
+        # The connection() user that holds the connection, if any
+        self._owner: object | None = None
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._order = itertools.count()
+
+    async def acquire(self, priority: int) -> None:
+        """Wait until the connection is ours."""
+
+        if not self.busy and len(self._waiters) == 0:
+            self.busy = True
+            return
+
+        waiter = (priority, next(self._order), asyncio.get_running_loop().create_future())
+        heapq.heappush(self._waiters, waiter)
+        try:
+            await waiter[2]
+        except asyncio.CancelledError:
+            if waiter[2].done() and not waiter[2].cancelled():
+                # We were granted the connection, so pass it on
+                self.release()
+            else:
+                self._waiters.remove(waiter)
+                heapq.heapify(self._waiters)
+            raise
+
+    def release(self) -> None:
+        """Pass the connection to the next waiting user, if any."""
+
+        while len(self._waiters) > 0:
+            _priority, _order, future = heapq.heappop(self._waiters)
+            if not future.done():
+                # Still busy, but now for the next user
+                future.set_result(None)
+                return
+        self.busy = False
+
+    def waiting(self, priority: int | None = None) -> bool:
+        """Is another user (with a higher priority, if given) waiting for the connection?"""
+
+        return any(
+            not future.done() and (priority is None or waiter_priority < priority)
+            for waiter_priority, _order, future in self._waiters
+        )
+
+    async def yield_to(self, priority: int) -> None:
+        """Let waiting users with a higher priority go first, then continue.
+
+        Called by long operations between requests, while logged in.
+        Logs in again if a higher priority user closed the connection.
+        Can raise exceptions from login().
+        """
+
+        if not self.waiting(priority):
+            return
+
+        _LOGGER.debug("Session yielding (priority %d)", priority)
+        # If we are cancelled while waiting, we no longer hold the connection
+        owner = self._owner
+        self._owner = None
+        self.release()
+        await self.acquire(priority)
+        self._owner = owner
+        await self.login()
+
+    async def login(self) -> None:
+        """Log in, unless we are already logged in.
+
+        Negotiates the frame size after the first login.
+        Can raise exceptions from login().
+        """
+
+        if self.conn.socket is None:
+            await self.conn.login()
+            await self.conn.negotiate()
+
+    @asynccontextmanager
+    async def connection(self, priority: int) -> AsyncIterator[sscp_connection]:
+        """Use the connection with the given priority.
+
+        The caller should log in with login().
+        Without an idle timeout, logs out when finished, unless another user is waiting.
+        """
+
+        await self.acquire(priority)
+        owner = object()
+        self._owner = owner
+        try:
+            yield self.conn
+        finally:
+            # Keepalives don't count as use
+            if priority != SSCP_PRIORITY_IDLE:
+                self.last_used = time.monotonic()
+            # A cancelled yield_to() has already given up the connection
+            if self._owner is owner:
+                self._owner = None
+                try:
+                    if self.idle_timeout == 0 and not self.waiting():
+                        await self.conn.logout()
+                finally:
+                    self.release()
+
+    async def check_idle(self) -> None:
+        """Log out after the idle timeout, or keep the idle connection alive.
+
+        Called periodically. Does nothing if the connection is in use or logged out.
+        """
+
+        if self.busy or self.conn.socket is None:
+            return
+        now = time.monotonic()
+        idle = now - self.last_used
+        if self.idle_timeout > 0 and idle >= self.idle_timeout:
+            _LOGGER.debug("Session idle for %d seconds, logging out", idle)
+            await self.close()
+        elif self.keepalive > 0 and now - max(self.last_used, self._last_keepalive) >= self.keepalive:
+            self._last_keepalive = now
+            async with self.connection(SSCP_PRIORITY_IDLE) as conn:
+                if conn.socket is None:
+                    return
+                try:
+                    await conn.get_info()
+                except (TimeoutError, ValueError, OSError) as e:
+                    _LOGGER.debug("Session keepalive failed: %s", e)
+
+    async def close(self) -> None:
+        """Log out (when the connection is free)."""
+
+        async with self.connection(SSCP_PRIORITY_IDLE) as conn:
+            await conn.logout()
@@ -0,0 +1,253 @@
+"""SSCP (Shark Slave Communications Protocol) shared TCP transport.
+
+See Also:
+  https://kb.mervis.info/lib/exe/fetch.php/cs:mervis-ide:sharkprotocolspecification_user_2017_05_30.pdf
+"""
+
+import asyncio
+from errno import errorcode
+import logging
+import select
+import socket
+
+from .sscp_const import (
+    SSCP_DATA_ORDER,
+    SSCP_DATALEN_END,
+    SSCP_DATALEN_START,
+    SSCP_TCP_KEEPCNT,
+    SSCP_TCP_KEEPIDLE,
+    SSCP_TCP_KEEPINTVL,
+    SSCP_TIMEOUT_CONNECT,
+    SSCP_TIMEOUT_DATA,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Transports, per (IP address, port)
+_transports: dict[tuple[str, int], "sscp_transport"] = {}
+
+
+class sscp_transport:
+    """SSCP Transport.
+
+    One TCP connection to a server/PLC (or gateway), shared by the logged in connections
+    for all of its SSCP addresses.
+    Requests and their replies are exchanged one at a time.
+    """
+
+    def __init__(self, ip_address: str, port: int) -> None:
+        """Configure the transport for a server."""
+
+        self.ip_address = ip_address
+        self.port = port
+        self.socket = None
+        self.sockfd = 0
+        # Counts the TCP connections, so that users can tell when their login was lost
+        self.connects = 0
+        self.users = 0
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def acquire(cls, ip_address: str, port: int) -> "sscp_transport":
+        """Return the shared transport for a server, for a new user."""
+
+        transport = _transports.get((ip_address, port))
+        if transport is None:
+            transport = cls(ip_address, port)
+            _transports[(ip_address, port)] = transport
+        transport.users += 1
+        _LOGGER.debug("Transport %s:%d users: %d", ip_address, port, transport.users)
+        return transport
+
+    def release(self) -> bool:
+        """A user has finished with the transport.
+
+        Returns True if this was the last user: the caller should close the transport.
+        """
+
+        self.users -= 1
+        _LOGGER.debug("Transport %s:%d users: %d", self.ip_address, self.port, self.users)
+        if self.users > 0:
+            return False
+        if _transports.get((self.ip_address, self.port)) is self:
+            del _transports[(self.ip_address, self.port)]
+        return True
+
+    async def connect(self) -> None:
+        """Create the socket connection to the server, unless we are already connected.
+
+        Can raise ConnectionError or OSError.
+        """
+
+        async with self._lock:
+            await self._connect()
+
+    async def _connect(self) -> None:
+        """Create the socket connection to the server, while we have the lock."""
+
+        if self.socket is not None:
+            return
+
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        # Logins on an earlier connection are lost, even while this one is connecting
+        self.connects += 1
+        self.socket.settimeout(SSCP_TIMEOUT_CONNECT)
+        self.socket.setblocking(False)
+        # Detect dead connections (and keep NAT entries) while we are idle
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        if hasattr(socket, "TCP_KEEPIDLE"):
+            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, SSCP_TCP_KEEPIDLE)
+            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, SSCP_TCP_KEEPINTVL)
+            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, SSCP_TCP_KEEPCNT)
+        self.sockfd = self.socket.fileno()
+        try:
+            self.socket.connect((self.ip_address, self.port))
+        except ConnectionError as e:
+            _LOGGER.error("Login: Connect failed: %s", e)
+            self.close()
+            raise ConnectionError from e
+        except OSError as e:
+            if e.errno != 115:  # Operation in progress
+                _LOGGER.error("Login: Connect failed: %s", e)
+                self.close()
+                raise OSError from e
+        # Wait for the socket to connect, or timeout
+        t = 0
+        while True:
+            if self.socket is None:
+                _LOGGER.error("Socket connect failed")
+                raise ConnectionError("Socket connect failed")
+            stat = self.socket.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+            if stat != 0:
+                _LOGGER.error("Login: connect failed: %s", errorcode[stat])
+                self.close()
+                raise ConnectionError(errorcode[stat])
+            _rlist, wlist, _xlist = select.select([], [self.sockfd], [], 0)
+            if len(wlist) == 0:
+                await asyncio.sleep(1)
+                t += 1
+                if t == SSCP_TIMEOUT_CONNECT:
+                    _LOGGER.error("Socket connect timeout")
+                    self.close()
+                    raise ConnectionError("Socket connect timeout")
+            else:
+                break
+
+    def close(self) -> None:
+        """Close the socket connection: all logins on it are lost."""
+
+        if self.socket is not None:
+            self.socket.close()
+            self.socket = None
+
+    async def sendrecv(
+        self,
+        request: bytearray,
+        recv_max: int,
+        prefix="Socket",
+        close_after_send=False,
+    ) -> bytearray:
+        """Send/receive data on the socket.
+
+        Ensure that socket is ready for write or read.
+        Ensure that we read enough data from the socket for a complete reply.
+        Ensure that the reply is from the SSCP address of the request.
+        Handle socket errors.
+        Can raise ConnectionError or OSError if no data can be sent, or the server closed
+        the connection.
+        Can raise TimeoutError if no data can be received.
+        Can raise ValueError if unexpected data is received.
+        If close_after_send is True, no exceptions are raised and the socket is always closed.
+        """
+
+        async with self._lock:
+            return await self._sendrecv(request, recv_max, prefix, close_after_send)
+
+    async def _sendrecv(
+        self,
+        request: bytearray,
+        recv_max: int,
+        prefix: str,
+        close_after_send: bool,
+    ) -> bytearray:
+        """Send/receive data on the socket, while we have the lock."""
+
+        if self.socket is None:
+            if close_after_send is not True:
+                _LOGGER.error("%s: send/recv without socket", prefix)
+                raise ConnectionError("Socket not writeable")
+            return bytearray()
+
+        # Write the request
+        try:
+            _rlist, wlist, _xlist = select.select([], [self.sockfd], [], 0)
+            if len(wlist) == 0:
+                self.close()
+                if close_after_send is not True:
+                    _LOGGER.error("%s: socket not writeable", prefix)
+                    raise ConnectionError("Socket not writeable")
+                return bytearray()
+
+            _LOGGER.debug("%s request: %s", prefix, request.hex())
+            self.socket.sendall(request)
+        except OSError as e:
+            self.close()
+            if close_after_send is not True:
+                _LOGGER.error("%s: send failed: %s", prefix, e)
+                raise OSError from e
+            return bytearray()
+
+        if close_after_send is True:
+            self.close()
+            return bytearray()
+
+        reply = bytearray()
+
+        # Read at least as far as the data length
+        t = 0
+        while len(reply) < SSCP_DATALEN_END:
+            rlist, _wlist, _xlist = select.select([self.sockfd], [], [], 0)
+            if len(rlist) > 0:
+                received = self.socket.recv(SSCP_DATALEN_END + recv_max - len(reply))
+                if len(received) == 0:
+                    _LOGGER.warning("%s: connection closed by server", prefix)
+                    self.close()
+                    raise ConnectionError("Connection closed by server")
+                reply += received
+            if len(reply) < SSCP_DATALEN_END:
+                await asyncio.sleep(1)
+                t += 1
+                if t >= SSCP_TIMEOUT_DATA:
+                    _LOGGER.error("%s: receive header timeout", prefix)
+                    self.close()
+                    raise TimeoutError("Receive header timeout")
+
+        data_len = int.from_bytes(
+            reply[SSCP_DATALEN_START:SSCP_DATALEN_END], SSCP_DATA_ORDER
+        )
+        if data_len > recv_max or reply[0] != request[0]:
+            _LOGGER.error("%s: unexpected data received", prefix)
+            self.close()
+            raise ValueError("Unexpected data received")
+
+        # Read the rest of the data
+        t = 0
+        while len(reply) < SSCP_DATALEN_END + data_len:
+            rlist, _wlist, _xlist = select.select([self.sockfd], [], [], 0)
+            if len(rlist) > 0:
+                received = self.socket.recv(SSCP_DATALEN_END + recv_max - len(reply))
+                if len(received) == 0:
+                    _LOGGER.warning("%s: connection closed by server", prefix)
+                    self.close()
+                    raise ConnectionError("Connection closed by server")
+                reply += received
+            if len(reply) < SSCP_DATALEN_END + data_len:
+                await asyncio.sleep(1)
+                t += 1
+                if t >= SSCP_TIMEOUT_DATA:
+                    _LOGGER.error("%s: receive data timeout", prefix)
+                    self.close()
+                    raise TimeoutError("Receive data timeout")
+
+        _LOGGER.debug("%s reply: %s", prefix, reply.hex())
+        return reply
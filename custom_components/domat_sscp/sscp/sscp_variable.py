@@ -5,18 +5,11 @@ See Also:
 """
 
 import logging
+import struct
 from typing import Any
 
-from .sscp_const import (
-    IEEE754_EXPONENT,
-    IEEE754_EXPONENT_BIAS,
-    IEEE754_EXPONENT_SHIFT,
-    IEEE754_MAXIMUM_BITS,
-    IEEE754_SIGN,
-    IEEE754_SIGNIFICAND,
-    IEEE754_SIGNIFICAND_LENGTH,
-    SSCP_DATA_ORDER,
-)
+from .sscp_codec import get_codec, unknown_codec
+from .sscp_const import SSCP_DATA_ORDER
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -25,10 +18,40 @@ class sscp_variable:
     """SSCP Variable.
 
     Handles known types and their properties.
-    Converts type 13 4-byte floats to and from IEEE754 format.
+    Converts raw values to and from values with the codec for the type.
     Converts states to values and vice versa.
+    Uses slots, as there is one per polled variable.
     """
 
+    __slots__ = (
+        "address_bytes",
+        "codec",
+        "description",
+        "format",
+        "key",
+        "layout",
+        "length",
+        "maximum",
+        "minimum",
+        "name",
+        "next_states",
+        "offset",
+        "packed",
+        "page",
+        "perm",
+        "previous_states",
+        "raw",
+        "record_length",
+        "state",
+        "state_texts",
+        "states",
+        "step",
+        "type",
+        "uid",
+        "val",
+        "write_descending",
+    )
+
     def __init__(
         self,
         uid: int,
@@ -51,9 +74,16 @@ class sscp_variable:
         self.length = length
         self.offset = offset
         self.type = type
-        # We support a subset of types
-        if self.type not in {64, 18, 13, 2, 0}:
+        self.codec = get_codec(self.type)
+        if self.codec is None:
             _LOGGER.warning("Unknown type for %d", self.uid)
+            self.codec = unknown_codec
+        # Values with the codec's size are unpacked with the codec's format, others as bytes
+        self.packed = self.codec.struct is not None and self.length == self.codec.size
+        if self.packed:
+            self.layout = self.codec.format
+        else:
+            self.layout = f"{self.length}s"
         self.name = name
         self.description = description
         self.page = page
@@ -64,6 +94,19 @@ class sscp_variable:
         else:
             self.step = 0
         self.states = states
+        # State texts and next/previous states, by state (only with states)
+        self.state_texts: dict[int, str] | None = None
+        self.next_states: dict[int, int] | None = None
+        self.previous_states: dict[int, int] | None = None
+        if states is not None:
+            self.state_texts = {}
+            self.next_states = {}
+            self.previous_states = {}
+            for state in states:
+                self.state_texts[state["state"]] = state["text"]
+                if state.get("nextstate") is not None:
+                    self.next_states[state["state"]] = state["nextstate"]
+                    self.previous_states[state["nextstate"]] = state["state"]
         self.format = format
         if perm is None or perm == "ro":
             self.perm = "ro"
@@ -72,9 +115,16 @@ class sscp_variable:
         else:
             raise ValueError("Invalid permission")
 
-        self.uid_bytes = self.uid.to_bytes(4, SSCP_DATA_ORDER)
-        self.length_bytes = self.length.to_bytes(4, SSCP_DATA_ORDER)
-        self.offset_bytes = self.offset.to_bytes(4, SSCP_DATA_ORDER)
+        # UID, offset and length, as they are sent in requests
+        self.address_bytes = (
+            self.uid.to_bytes(4, SSCP_DATA_ORDER)
+            + self.offset.to_bytes(4, SSCP_DATA_ORDER)
+            + self.length.to_bytes(4, SSCP_DATA_ORDER)
+        )
+        self.key = (self.uid, self.offset, self.length)
+        # Segmented writes don't split records, and can write the last record first
+        self.record_length = 1
+        self.write_descending = False
         self.raw = None
         self.val = None
         self.state = "unknown"
@@ -131,7 +181,7 @@ class sscp_variable:
         if self.raw is None:
             return None
 
-        if self.type in {13, 2, 0}:
+        if self.codec.numeric:
             if self.states is not None:
                 return self.state
             if self.format is not None:
@@ -154,30 +204,17 @@ class sscp_variable:
         self.raw = raw
         _LOGGER.debug("Set %d to 0x%s", self.uid, self.raw.hex())
 
-        match self.type:
-            case 18:  # 8-byte int
-                self.val = int.from_bytes(raw, SSCP_DATA_ORDER)
-            case 13:  # 4-byte float
-                self.val = ieee754_to_float(raw)
-            case 2:  # 2-byte int or state
-                self.val = int.from_bytes(raw, SSCP_DATA_ORDER)
-                if self.states is not None:
-                    self.state = "unknown"  # Default
-                    for state in self.states:
-                        if state["state"] == self.val:
-                            self.state = state["text"]
-            case 0:  # bool (1-byte int)
-                self.val = int.from_bytes(raw, SSCP_DATA_ORDER)
-                if self.states is not None:
-                    self.state = "unknown"  # Default
-                    for state in self.states:
-                        if state["state"] == self.val:
-                            self.state = state["text"]
-            case 64:  # scehdule (converted in schedule classes)
-                self.val = raw
-            case _:  # unknown type
-                _LOGGER.warning("Set unknown type for %d", self.uid)
-                self.val = int.from_bytes(raw, SSCP_DATA_ORDER)
+        self.val = self.codec.decode(raw)
+        if self.states is not None:
+            self.state = self.state_texts.get(self.val, "unknown")
+
+    def set_unpacked(self, raw: bytearray, val: Any) -> None:
+        """Set the variable to the new raw value, and its value unpacked from a reply frame."""
+
+        self.raw = raw
+        self.val = val if self.packed else self.codec.decode(raw)
+        if self.states is not None:
+            self.state = self.state_texts.get(self.val, "unknown")
 
     def change_value(self, new: Any) -> None:
         """Change the variable using the new readable value.
@@ -198,151 +235,47 @@ class sscp_variable:
             msg = f"Variable has no new value: {self.uid}"
             raise ValueError(msg)
 
-        match self.type:
-            case 13:  # 4-byte float
-                if new == "+" and self.step != 0:
-                    self.val = self.val + self.step
-                elif new == "-" and self.step != 0:
-                    self.val = self.val - self.step
-                else:
-                    self.val = float(new)
-                if self.maximum is not None and self.val > self.maximum:
-                    self.val = self.maximum
-                if self.minimum is not None and self.val < self.minimum:
-                    self.val = self.minimum
-                self.raw = float_to_ieee754(self.val)
-                _LOGGER.debug("New 4-byte: %s (%s)", self.val, self.raw.hex())
-                return
-
-            case 2:  # 2-byte int or state
-                if self.states is not None:
-                    self.val, self.raw = change_state(
-                        uid=self.uid,
-                        length=self.length,
-                        states=self.states,
-                        old=self.val,
-                        new=new,
-                    )
-                if isinstance(new, str) and new.lower().startswith("0x"):
-                    self.val = int(new, 16)
-                else:
-                    self.val = int(new)
-                self.raw = self.val.to_bytes(2, SSCP_DATA_ORDER)
-                _LOGGER.debug("New 2-byte: %s (%s)", self.val, self.raw.hex())
-                return
-
-            case 0:  # 1-byte int (bool) or state
-                if self.states is not None:
-                    self.val, self.raw = change_state(
-                        uid=self.uid,
-                        length=self.length,
-                        states=self.states,
-                        old=self.val,
-                        new=new,
-                    )
-                if new in {"+", "-"}:
-                    if self.val == 0:
-                        self.val = 1
-                    else:
-                        self.val = 0
-                elif isinstance(new, str) and new.lower().startswith("0x"):
-                    self.val = int(new, 16)
-                else:
-                    self.val = int(new)
-                self.raw = self.val.to_bytes(1, SSCP_DATA_ORDER)
-                _LOGGER.debug("New 1-byte: %s (%s)", self.val, self.raw.hex())
-                return
-
-            case _:
-                _LOGGER.debug("Change unknown type: %d", self.uid)
-                if isinstance(new, str) and new.lower().startswith("0x"):
-                    self.val = int(new, 16)
-                else:
-                    self.val = int(new)
-                self.raw = self.val.to_bytes(self.length, SSCP_DATA_ORDER)
-                _LOGGER.debug("New %s-byte: %s (%s)", self.length, self.val, self.raw.hex())
-                return
-
-        msg = f"Unmatched variable type: {self.uid}"
-        raise ValueError(msg)
+        if self.codec.is_float:
+            if new == "+" and self.step != 0:
+                self.val = self.val + self.step
+            elif new == "-" and self.step != 0:
+                self.val = self.val - self.step
+            else:
+                self.val = float(new)
+            if self.maximum is not None and self.val > self.maximum:
+                self.val = self.maximum
+            if self.minimum is not None and self.val < self.minimum:
+                self.val = self.minimum
+        elif self.states is not None:
+            self.val = change_state(self, new)
+        elif new in {"+", "-"} and self.type == 0:
+            self.val = 0 if self.val else 1
+        elif isinstance(new, str) and new.lower().startswith("0x"):
+            self.val = int(new, 16)
+        else:
+            self.val = int(new)
 
+        try:
+            self.raw = self.codec.encode(self.val, self.length)
+        except (OverflowError, struct.error) as e:
+            msg = f"Value does not fit variable: {self.uid}"
+            raise ValueError(msg) from e
+        _LOGGER.debug("New %s-byte: %s (%s)", self.length, self.val, self.raw.hex())
 
-def ieee754_to_float(byte4) -> float:
-    """Convert IEEE754 hex representation to float."""
-    if len(byte4) != 4:
-        return 0.0
 
-    val = int.from_bytes(byte4, SSCP_DATA_ORDER)
-    if val == 0:
-        return 0.0
-    if val & IEEE754_SIGN:
-        sign = 1
-    else:
-        sign = 0
-    exp = ((val & IEEE754_EXPONENT) >> IEEE754_EXPONENT_SHIFT) - IEEE754_EXPONENT_BIAS
-    sig = val & IEEE754_SIGNIFICAND
-    res = pow(2, exp)
-    mult = 1
-    for i in range(1, IEEE754_SIGNIFICAND_LENGTH + 1):
-        if sig & (1 << (IEEE754_SIGNIFICAND_LENGTH - i)):
-            mult += 1.0 / pow(2, i)
-    res *= mult
-    if sign == 1:
-        res = 0.0 - res
-    _LOGGER.debug("IEEE754: 0x%08x = %f", (sign + exp + sig), res)
-    return res
-
-
-def float_to_ieee754(val) -> bytes:
-    """Convert float to IEEE754 hex representation."""
-    if val == 0:
-        return (0).to_bytes(4, SSCP_DATA_ORDER)
-    if val < 0:
-        sign = IEEE754_SIGN
-        val = 0 - val
-    else:
-        sign = 0
-    max2 = 0
-    for i in range(IEEE754_MAXIMUM_BITS):
-        if (1 << i) < val:
-            max2 = i
-    exp = (max2 + IEEE754_EXPONENT_BIAS) << IEEE754_EXPONENT_SHIFT
-    mult = val / (1 << max2) - 1
-    sig = 0
-    for i in range(1, IEEE754_SIGNIFICAND_LENGTH):
-        div = 1.0 / pow(2, i)
-        if div <= mult:
-            sig = sig | (1 << (IEEE754_SIGNIFICAND_LENGTH - i))
-            mult -= div
-    _LOGGER.debug("IEEE754: %f = 0x%08x", val, (sign + exp + sig))
-    return (sign + exp + sig).to_bytes(4, SSCP_DATA_ORDER)
-
-
-def change_state(
-    uid: int, length: int, states: dict[str, Any], old: int, new: str | int
-) -> tuple[int, bytearray]:
+def change_state(var: sscp_variable, new: str | int) -> int:
     """Find the next, previous or matching state."""
 
     if new == "+":
-        for state in states:
-            if (state["state"] == old) and state.get("nextstate") is not None:
-                _LOGGER.debug("new state +: %s %s", uid, state["nextstate"])
-                val = state["nextstate"]
-                raw = state["nextstate"].to_bytes(length, SSCP_DATA_ORDER)
-                return [val, raw]
+        val = var.next_states.get(var.val)
     elif new == "-":
-        for state in states:
-            if state.get("nextstate") is not None and state["nextstate"] == old:
-                _LOGGER.debug("new state -: %s %s", uid, state["state"])
-                val = state["state"]
-                raw = state["state"].to_bytes(length, SSCP_DATA_ORDER)
-                return [val, raw]
+        val = var.previous_states.get(var.val)
+    elif isinstance(new, str) and new.lower().startswith("0x"):
+        val = int(new, 16)
     else:
         val = int(new)
-        for state in states:
-            if state["state"] == val:
-                _LOGGER.debug("new state: %s %s", uid, state["state"])
-                raw = state["state"].to_bytes(length, SSCP_DATA_ORDER)
-                return [val, raw]
-    msg = f"Unknown state or next state: {uid}"
-    raise ValueError(msg)
+    if val is None or val not in var.state_texts:
+        msg = f"Unknown state or next state: {var.uid}"
+        raise ValueError(msg)
+    _LOGGER.debug("new state %s: %s %s", new, var.uid, val)
+    return val
@@ -0,0 +1,112 @@
+"""Connection warm-up for the Domat SSCP integration."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+
+from .const import WARMUP_CONCURRENCY
+from .coordinator import DomatSSCPCoordinator
+from .sessions import DomatSSCPSessions
+from .sscp.sscp_const import SSCP_PRIORITY_READ
+from .sscp.sscp_session import sscp_session
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class DomatSSCPWarmup:
+    """Log in to the servers/PLC's of all config entries concurrently at startup.
+
+    Each config entry setup can wait for the login of its (shared) session.
+    Reports the time until each connection, and all connections, have data.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entries: list[ConfigEntry],
+        sessions: DomatSSCPSessions,
+    ) -> None:
+        """Start logging in for the (enabled) config entries.
+
+        Config entries that share a session only log in once.
+        """
+
+        self.started = time.monotonic()
+        self.first_data_times: dict[str, float] = {}
+        self._semaphore = asyncio.Semaphore(WARMUP_CONCURRENCY)
+        self._tasks: dict[str, asyncio.Task[None]] = {}
+        self._waiting: set[str] = set()
+
+        session_tasks: dict[int, asyncio.Task[None]] = {}
+        for entry in entries:
+            if entry.disabled_by is not None:
+                continue
+            try:
+                session = sessions.async_acquire(entry)
+            except ValueError:
+                _LOGGER.error("Warm-up: could not create a connection for %s", entry.title)
+                continue
+            self._waiting.add(entry.entry_id)
+            if id(session) not in session_tasks:
+                session_tasks[id(session)] = hass.async_create_background_task(
+                    self._async_warm_up(entry, session), name=f"{entry.title} warm-up"
+                )
+            self._tasks[entry.entry_id] = session_tasks[id(session)]
+        _LOGGER.debug("Warming up %d connections", len(session_tasks))
+
+    async def _async_warm_up(
+        self, entry: ConfigEntry, session: sscp_session
+    ) -> None:
+        """Log in.
+
+        Login errors are only logged: the first refresh will try again.
+        """
+
+        async with self._semaphore:
+            # Other users of the session wait until we have logged in (and negotiated)
+            async with session.connection(SSCP_PRIORITY_READ):
+                try:
+                    await session.login()
+                except (TimeoutError, ValueError, OSError) as e:
+                    _LOGGER.warning("Warm-up: login failed for %s: %s", entry.title, e)
+
+    async def async_wait(self, entry_id: str) -> None:
+        """Wait for the warm-up login of a config entry (only once)."""
+
+        task = self._tasks.pop(entry_id, None)
+        if task is not None:
+            await task
+
+    @callback
+    def async_track_first_data(self, coordinator: DomatSSCPCoordinator) -> None:
+        """Report the time until the co-ordinator has (fresh) data."""
+
+        entry_id = coordinator.config_entry.entry_id
+        if entry_id not in self._waiting:
+            return
+
+        @callback
+        def _async_first_data() -> None:
+            if coordinator.stale or not coordinator.last_update_success:
+                return
+            if entry_id not in self._waiting:
+                return
+            self._waiting.discard(entry_id)
+            remove_listener()
+
+            elapsed = time.monotonic() - self.started
+            self.first_data_times[entry_id] = elapsed
+            _LOGGER.info("First data for %s after %.1f seconds", coordinator.name, elapsed)
+            if len(self._waiting) == 0:
+                _LOGGER.info(
+                    "First data for all %d connections after %.1f seconds",
+                    len(self.first_data_times),
+                    elapsed,
+                )
+
+        remove_listener = coordinator.async_add_listener(_async_first_data)
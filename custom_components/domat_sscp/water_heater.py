@@ -10,14 +10,14 @@ from homeassistant.components.water_heater import (
     WaterHeaterEntityFeature,
 )
 from homeassistant.const import ATTR_TEMPERATURE, Platform
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import DomatSSCPConfigEntry
 from .const import DOMAIN
 from .coordinator import DomatSSCPCoordinator
+from .entity import DomatSSCPEntity
 
 # The co-ordinator is used to centralise the data updates
 PARALLEL_UPDATES = 0
@@ -39,28 +39,21 @@ async def async_setup_entry(
 
     # Add climates (class) with their initialisation data
     water_heaters: list[WaterHeaterEntity] = []
-    for opt in config_entry.options:
-        if (
-            "entity" in config_entry.options[opt]
-            and config_entry.options[opt]["entity"] == Platform.WATER_HEATER
-        ):
-            _LOGGER.debug("Adding water heater %s: %s", opt, config_entry.options[opt])
-            water_heaters.append(
-                DomatSSCPWaterHeater(
-                    coordinator=coordinator,
-                    entity_id=opt,
-                    entity_data=config_entry.options[opt],
-                )
+    for opt, entity_data in coordinator.index.platform(Platform.WATER_HEATER).items():
+        _LOGGER.debug("Adding water heater %s: %s", opt, entity_data)
+        water_heaters.append(
+            DomatSSCPWaterHeater(
+                coordinator=coordinator,
+                entity_id=opt,
+                entity_data=entity_data,
             )
+        )
     async_add_entities(water_heaters)
 
 
-class DomatSSCPWaterHeater(CoordinatorEntity, WaterHeaterEntity):
+class DomatSSCPWaterHeater(DomatSSCPEntity, WaterHeaterEntity):
     """Water heater type for SSCP, using coordinator for updates."""
 
-    _attr_has_entity_name = True
-    _attr_entity_registry_enabled_default = True
-
     def __init__(
         self,
         coordinator: DomatSSCPCoordinator,
@@ -69,14 +62,12 @@ class DomatSSCPWaterHeater(CoordinatorEntity, WaterHeaterEntity):
     ) -> None:
         """Initialise a water heater with provided data."""
 
-        super().__init__(coordinator)
+        super().__init__(coordinator, entity_id)
 
         # We only use target temperature
         self._attr_supported_features = WaterHeaterEntityFeature.TARGET_TEMPERATURE
 
         # Entity-specific values
-        self.coordinator = coordinator
-        self._attr_unique_id = entity_id
         self._attr_native_unit_of_measurement = entity_data["unit"]
         if "name" in entity_data:
             self._attr_name = entity_data["name"]
@@ -103,12 +94,10 @@ class DomatSSCPWaterHeater(CoordinatorEntity, WaterHeaterEntity):
         self.sscp_type = entity_data["type"]
         _LOGGER.debug("Initialised new %s with: %s", entity_id, entity_data)
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
+    def _update_from_coordinator(self) -> None:
+        """Update our value from the co-ordinator data."""
 
         self._attr_target_temperature = self._update_target()
-        self.async_write_ha_state()
 
     @property
     def target_temperature(self) -> float | None:
@@ -116,14 +105,6 @@ class DomatSSCPWaterHeater(CoordinatorEntity, WaterHeaterEntity):
 
         return self._attr_target_temperature
 
-    @property
-    def available(self) -> bool:
-        """Is state available?"""
-
-        if self.unique_id in self.coordinator.data:
-            return True
-        return False
-
     def set_temperature(self, **kwargs: Any) -> None:
         """Set the target temperature using the co-ordinator function."""
 